@@ -1,14 +1,101 @@
 #pragma once
 
+#include <algorithm>
 #include <random>
 #include <chrono>
+#include <cstdint>
+#include <limits>
+#include <stdexcept>
 
 namespace mms {
 
+// 128-bit arithmetic for the PCG state (GCC/Clang extension; __extension__
+// keeps -Wpedantic quiet)
+__extension__ typedef unsigned __int128 uint128_t;
+
+// PCG64 (PCG XSL RR 128/64, the generator behind NumPy's default_rng):
+// a 128-bit LCG with a permuted 64-bit output. Much smaller state than
+// mt19937_64 (32 bytes vs 2.5 KB), cheaper per draw, and it supports
+// O(log n) jump-ahead plus independent streams selected by the increment.
+// Satisfies UniformRandomBitGenerator, so it works with <random> distributions.
+class Pcg64 {
+public:
+    using result_type = uint64_t;
+    
+    explicit Pcg64(uint64_t seed = 0, uint64_t stream = 0) { this->seed(seed, stream); }
+    
+    static constexpr result_type min() { return 0; }
+    static constexpr result_type max() { return std::numeric_limits<result_type>::max(); }
+    
+    // Seed state and stream; the 64-bit inputs are spread over the 128-bit
+    // state with SplitMix64 so nearby seeds (seed, seed + 1, ...) decorrelate
+    void seed(uint64_t seed, uint64_t stream = 0) {
+        uint64_t sm = seed;
+        uint128_t init_state = (static_cast<uint128_t>(splitmix64(sm)) << 64) | splitmix64(sm);
+        uint64_t ss = stream;
+        uint128_t init_seq = (static_cast<uint128_t>(splitmix64(ss)) << 64) | splitmix64(ss);
+        
+        state_ = 0;
+        inc_ = (init_seq << 1) | 1u;
+        step();
+        state_ += init_state;
+        step();
+    }
+    
+    result_type operator()() {
+        step();
+        // XSL RR output: xor-fold the halves, rotate by the top 6 bits
+        const auto folded = static_cast<uint64_t>(state_ >> 64) ^ static_cast<uint64_t>(state_);
+        const auto rot = static_cast<unsigned>(state_ >> 122);
+        return (folded >> rot) | (folded << ((64u - rot) & 63u));
+    }
+    
+    // Jump ahead by delta draws in O(log delta) (Brown, "Random number
+    // generation with arbitrary strides")
+    void advance(uint128_t delta) {
+        uint128_t cur_mult = MULTIPLIER;
+        uint128_t cur_plus = inc_;
+        uint128_t acc_mult = 1u;
+        uint128_t acc_plus = 0u;
+        while (delta > 0) {
+            if (delta & 1u) {
+                acc_mult *= cur_mult;
+                acc_plus = acc_plus * cur_mult + cur_plus;
+            }
+            cur_plus = (cur_mult + 1u) * cur_plus;
+            cur_mult *= cur_mult;
+            delta >>= 1;
+        }
+        state_ = acc_mult * state_ + acc_plus;
+    }
+    
+    void discard(unsigned long long n) { advance(n); }
+    
+    bool operator==(const Pcg64& other) const {
+        return state_ == other.state_ && inc_ == other.inc_;
+    }
+
+private:
+    static constexpr uint128_t MULTIPLIER =
+        (static_cast<uint128_t>(0x2360ED051FC65DA4ULL) << 64) | 0x4385DF649FCCF645ULL;
+    
+    void step() { state_ = state_ * MULTIPLIER + inc_; }
+    
+    static uint64_t splitmix64(uint64_t& x) {
+        uint64_t z = (x += 0x9E3779B97F4A7C15ULL);
+        z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+        z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+        return z ^ (z >> 31);
+    }
+    
+    uint128_t state_ = 0;
+    uint128_t inc_ = 1;
+};
+
 // Seeded random number generator for reproducible simulations
 class RNG {
 public:
-    explicit RNG(uint64_t seed = 0) : gen_(seed) {}
+    explicit RNG(uint64_t seed = 0, uint64_t stream = 0) : gen_(seed, stream), seed_(seed) {}
     
     // Generate uniform random integer in [min, max]
     template<typename T>
@@ -53,14 +140,23 @@ public:
         return dist(gen_);
     }
     
-    // Reset with new seed
-    void seed(uint64_t new_seed) {
-        gen_.seed(new_seed);
+    // Reset with new seed (and optionally a new stream)
+    void seed(uint64_t new_seed, uint64_t stream = 0) {
+        gen_.seed(new_seed, stream);
+        seed_ = new_seed;
     }
     
     // Get current seed (for debugging)
     uint64_t get_seed() const {
-        return gen_.default_seed;
+        return seed_;
+    }
+    
+    // Copy of this generator advanced by jumps * 2^64 draws: a
+    // non-overlapping substream for a parallel consumer
+    RNG jumped(uint64_t jumps = 1) const {
+        RNG copy(*this);
+        copy.gen_.advance(static_cast<uint128_t>(jumps) << 64);
+        return copy;
     }
     
     // Generate random boolean
@@ -87,7 +183,8 @@ public:
     }
 
 private:
-    std::mt19937_64 gen_;
+    Pcg64 gen_;
+    uint64_t seed_;
 };
 
 // Utility function to generate seed from current time
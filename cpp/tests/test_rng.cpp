@@ -133,6 +133,48 @@ TEST_F(RNGTest, SeedReset) {
     EXPECT_EQ(rng1.uniform_int(1, 100), rng2.uniform_int(1, 100));
 }
 
+TEST_F(RNGTest, Pcg64AdvanceMatchesStepping) {
+    Pcg64 stepped(42);
+    Pcg64 advanced(42);
+    
+    for (int i = 0; i < 1000; ++i) {
+        stepped();
+    }
+    advanced.advance(1000);
+    
+    EXPECT_EQ(stepped, advanced);
+    EXPECT_EQ(stepped(), advanced());
+}
+
+TEST_F(RNGTest, StreamsAreIndependent) {
+    Pcg64 gen1(42, 0);
+    Pcg64 gen2(42, 1);
+    
+    // Same seed, different stream: different sequences
+    bool found_difference = false;
+    for (int i = 0; i < 100; ++i) {
+        if (gen1() != gen2()) {
+            found_difference = true;
+            break;
+        }
+    }
+    EXPECT_TRUE(found_difference);
+}
+
+TEST_F(RNGTest, JumpedSubstream) {
+    RNG base(123);
+    RNG jumped1 = base.jumped();
+    RNG jumped2 = base.jumped();
+    
+    // Jumping is deterministic and leaves the original generator untouched
+    EXPECT_DOUBLE_EQ(jumped1.uniform_real(), jumped2.uniform_real());
+    EXPECT_EQ(base.get_seed(), 123u);
+    
+    RNG fresh(123);
+    EXPECT_DOUBLE_EQ(base.uniform_real(), fresh.uniform_real());
+    EXPECT_NE(base.uniform_real(), jumped1.uniform_real());
+}
+
 TEST_F(RNGTest, ContainerShuffle) {
     std::vector<int> original = {1, 2, 3, 4, 5, 6, 7, 8, 9, 10};
     std::vector<int> shuffled = original;
@@ -3,43 +3,127 @@
 Market Microstructure Simulator - Web Dashboard
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
-import json
-import subprocess
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
+import orjson
+import asyncio
+import collections
+import functools
+import io
+import itertools
 import os
 import sys
-import pandas as pd
-import plotly
-import plotly.graph_objs as go
-from plotly.utils import PlotlyJSONEncoder
 import numpy as np
 from datetime import datetime
 import threading
 import time
 
+try:
+    # Linear-time DFA regex engine for large simulator outputs (optional)
+    import re2 as re
+except ImportError:
+    import re
+
 # Add the python directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'python'))
 
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (numpy arrays are serialized natively)"""
+    
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option),
+            mimetype='application/json'
+        )
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# In-process cache for generated dashboard payloads
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+
+# Maximum wall-clock time for one C++ simulation run (seconds)
+SIMULATION_TIMEOUT = 30
+
+# Number of log lines kept per simulation run
+LOG_HISTORY = 256
+
+# Refresh interval for the performance/order book snapshots (seconds)
+SNAPSHOT_REFRESH_SECONDS = 5
+
+# Summary lines of simple_sim output: label -> (results key, value parser)
+OUTPUT_METRICS = {
+    'Total Events Processed': ('events_processed', lambda value: int(value.replace(',', ''))),
+    'Total Trades': ('trades', lambda value: int(value.replace(',', ''))),
+    'Execution Time': ('execution_time_ms', lambda value: float(value.replace('ms', ''))),
+    'Events per Second': ('events_per_second', float),
+}
+
+# Agent summary line, e.g. "Agent 1: PnL=2.85898e+06, Inventory=-286"
+AGENT_LINE_RE = re.compile(
+    r'\s*Agent\s+(?P<id>[^\s:]+):?.*?'
+    r'PnL=(?P<pnl>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?),\s*'
+    r'Inventory=(?P<inventory>[-+]?\d+)'
+)
+
+# Lifetime of the generated demo chart data (seconds)
+CHART_REFRESH_SECONDS = 60
 
 # Global variables for simulation state
-simulation_results = {}
 simulation_running = False
-simulation_logs = []
 
 class SimulationRunner:
     def __init__(self):
         self.running = False
         self.results = {}
-        self.logs = []
+        self.logs = collections.deque(maxlen=LOG_HISTORY)
+        self.version = 0
+        self._changed = threading.Condition()
+    
+    def notify_update(self):
+        """Bump the status version and wake up status subscribers"""
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+    
+    def wait_for_update(self, last_version, timeout=None):
+        """Block until the status version differs from `last_version` (or timeout)"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != last_version, timeout)
+            return self.version
+    
+    def log(self, message):
+        """Append a log line (O(1), oldest lines drop off) and notify subscribers"""
+        self.logs.append(message)
+        self.notify_update()
     
-    def run_simulation(self, config):
-        """Run simulation in background thread"""
+    def status_snapshot(self):
+        """Current status payload shared by polling and push endpoints"""
+        return {
+            'running': self.running,
+            'results': self.results,
+            'logs': list(itertools.islice(self.logs, max(0, len(self.logs) - 10), None))  # Last 10 log entries
+        }
+    
+    async def run_simulation(self, config):
+        """Run simulation on the background event loop"""
         self.running = True
-        self.logs = []
+        self.logs.clear()
         
         try:
-            self.logs.append(f"Starting simulation at {datetime.now()}")
+            self.log(f"Starting simulation at {datetime.now()}")
             
             # Run the C++ simulation
             cmd = [
@@ -49,73 +133,144 @@ class SimulationRunner:
             # Change to build directory
             build_dir = os.path.join(os.path.dirname(__file__), '..', 'build')
             if not os.path.exists(build_dir):
-                self.logs.append("ERROR: Build directory not found. Please build the project first.")
+                self.log("ERROR: Build directory not found. Please build the project first.")
                 return
             
-            result = subprocess.run(
-                cmd,
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
                 cwd=build_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
             
-            if result.returncode == 0:
-                self.logs.append("Simulation completed successfully!")
-                self.results = self.parse_simulation_output(result.stdout)
+            # Parse output as it is produced so results surface while running
+            results = self.empty_results()
+            self.results = results
+            try:
+                # Drain stderr alongside stdout so the child cannot block on a full pipe
+                returncode, stderr = await asyncio.wait_for(
+                    asyncio.gather(self.stream_output(proc, results), proc.stderr.read()),
+                    SIMULATION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                self.log("Simulation timed out")
+                return
+            
+            if returncode == 0:
+                self.log("Simulation completed successfully!")
             else:
-                self.logs.append(f"Simulation failed: {result.stderr}")
+                self.log(f"Simulation failed: {stderr.decode(errors='replace')}")
                 
-        except subprocess.TimeoutExpired:
-            self.logs.append("Simulation timed out")
         except Exception as e:
-            self.logs.append(f"Error running simulation: {e}")
+            self.log(f"Error running simulation: {e}")
         finally:
             self.running = False
+            self.notify_update()
     
-    def parse_simulation_output(self, output):
-        """Parse simulation output into structured data"""
-        lines = output.strip().split('\n')
-        results = {
+    async def stream_output(self, proc, results):
+        """Feed simulator stdout to the parser line by line; returns the exit code"""
+        async for line in proc.stdout:
+            if self.parse_line(line.decode(), results):
+                self.notify_update()
+        return await proc.wait()
+    
+    @staticmethod
+    def empty_results():
+        """Results structure filled in by the output parser"""
+        return {
             'events_processed': 0,
             'trades': 0,
             'execution_time_ms': 0,
             'events_per_second': 0,
             'agent_performance': {}
         }
+    
+    def parse_line(self, line, results):
+        """Parse one line of simulation output into `results`; returns True if it matched"""
+        # One split + dict lookup on the label instead of a substring scan per metric
+        label, _, value = line.partition(':')
+        label = label.strip()
+        metric = OUTPUT_METRICS.get(label)
+        if metric is not None:
+            key, convert = metric
+            results[key] = convert(value.strip())
+            return True
         
-        for line in lines:
-            if 'Total Events Processed:' in line:
-                results['events_processed'] = int(line.split(':')[1].strip().replace(',', ''))
-            elif 'Total Trades:' in line:
-                results['trades'] = int(line.split(':')[1].strip().replace(',', ''))
-            elif 'Execution Time:' in line:
-                results['execution_time_ms'] = float(line.split(':')[1].strip().replace('ms', ''))
-            elif 'Events per Second:' in line:
-                results['events_per_second'] = float(line.split(':')[1].strip())
-            elif 'Agent' in line and 'PnL=' in line:
-                # Parse agent performance
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    agent_info = parts[1].strip()
-                    agent_id = agent_info.split()[1]
-                    pnl_start = agent_info.find('PnL=') + 4
-                    pnl_end = agent_info.find(',', pnl_start)
-                    pnl = float(agent_info[pnl_start:pnl_end])
-                    
-                    inventory_start = agent_info.find('Inventory=') + 10
-                    inventory = int(agent_info[inventory_start:])
-                    
-                    results['agent_performance'][agent_id] = {
-                        'pnl': pnl,
-                        'inventory': inventory
-                    }
-        
+        if label.startswith('Agent'):
+            # Parse agent performance
+            match = AGENT_LINE_RE.match(line)
+            if match is None:
+                return False
+            results['agent_performance'][match['id']] = {
+                'pnl': float(match['pnl']),
+                'inventory': int(match['inventory'])
+            }
+            return True
+        return False
+    
+    def parse_simulation_output(self, output):
+        """Parse simulation output into structured data"""
+        results = self.empty_results()
+        # Iterate lines lazily instead of materializing a list of all lines
+        for line in io.StringIO(output):
+            self.parse_line(line, results)
         return results
 
 # Global simulation runner
 sim_runner = SimulationRunner()
 
+# One event loop drives all simulator subprocesses and their output streams
+simulation_loop = asyncio.new_event_loop()
+threading.Thread(target=simulation_loop.run_forever, daemon=True).start()
+
+def sample_dashboard_snapshots():
+    """Sample the performance metrics and order book shown on the dashboard"""
+    return {
+        'performance': {
+            'cpu_usage': np.random.uniform(10, 80),
+            'memory_usage': np.random.uniform(20, 60),
+            'events_per_second': np.random.uniform(1000000, 5000000),
+            'latency_ms': np.random.uniform(0.1, 2.0)
+        },
+        'orderbook': {
+            'bids': [
+                {'price': 10000, 'quantity': 150},
+                {'price': 9999, 'quantity': 200},
+                {'price': 9998, 'quantity': 100}
+            ],
+            'asks': [
+                {'price': 10002, 'quantity': 120},
+                {'price': 10003, 'quantity': 180},
+                {'price': 10004, 'quantity': 90}
+            ],
+            'last_trade': {
+                'price': 10001,
+                'quantity': 50,
+                'timestamp': datetime.now().isoformat()
+            }
+        }
+    }
+
+def refresh_dashboard_snapshots():
+    """Resample dashboard snapshots in the background so requests only read them"""
+    global dashboard_snapshots
+    while True:
+        time.sleep(SNAPSHOT_REFRESH_SECONDS)
+        dashboard_snapshots = sample_dashboard_snapshots()
+
+# Precomputed snapshots served by /api/performance and /api/orderbook
+dashboard_snapshots = sample_dashboard_snapshots()
+threading.Thread(target=refresh_dashboard_snapshots, daemon=True).start()
+
+@app.after_request
+def conditional_response(response):
+    """Answer 304 Not Modified when the client's ETag still matches"""
+    if response.get_etag()[0] is not None:
+        response.make_conditional(request)
+    return response
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -146,22 +301,33 @@ def run_simulation():
     
     config = request.json
     
-    # Start simulation in background thread
+    # Schedule simulation on the background event loop
     simulation_running = True
-    thread = threading.Thread(target=sim_runner.run_simulation, args=(config,))
-    thread.daemon = True
-    thread.start()
+    asyncio.run_coroutine_threadsafe(sim_runner.run_simulation(config), simulation_loop)
     
     return jsonify({'message': 'Simulation started'})
 
 @app.route('/api/status')
 def get_status():
     """Get simulation status"""
-    return jsonify({
-        'running': sim_runner.running,
-        'results': sim_runner.results,
-        'logs': sim_runner.logs[-10:]  # Last 10 log entries
-    })
+    return jsonify(sim_runner.status_snapshot())
+
+@app.route('/api/events')
+def stream_status():
+    """Push simulation status to the browser as Server-Sent Events"""
+    def generate():
+        version = None
+        while True:
+            current = sim_runner.wait_for_update(version, timeout=15)
+            if current == version:
+                # No change within the timeout: keep the connection alive
+                yield ": keepalive\n\n"
+                continue
+            version = current
+            yield b"data: " + orjson.dumps(sim_runner.status_snapshot(), option=ORJSONProvider.option) + b"\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
 
 @app.route('/api/stop', methods=['POST'])
 def stop_simulation():
@@ -169,52 +335,68 @@ def stop_simulation():
     global simulation_running
     simulation_running = False
     sim_runner.running = False
+    sim_runner.notify_update()
     return jsonify({'message': 'Simulation stopped'})
 
+@functools.lru_cache(maxsize=8)
+def demo_market_series(seed, n):
+    """Deterministic demo series (timestamps, mid prices, spreads, volumes) for a seed"""
+    rng = np.random.default_rng(seed)
+    steps = rng.standard_normal(n)
+    steps *= 0.5
+    mid_prices = np.cumsum(steps, out=steps)
+    mid_prices += 10000
+    series = (np.arange(n), mid_prices, rng.uniform(1, 5, n), rng.poisson(50, n))
+    # Cached arrays are shared between requests
+    for values in series:
+        values.flags.writeable = False
+    return series
+
 @app.route('/api/charts')
+@cache.cached(timeout=CHART_REFRESH_SECONDS)
 def get_charts():
     """Generate sample charts for visualization"""
     
-    # Generate sample market data
-    timestamps = np.arange(0, 1000, 1)
-    mid_prices = 10000 + np.cumsum(np.random.randn(1000) * 0.5)
-    spreads = np.random.uniform(1, 5, 1000)
-    volumes = np.random.poisson(50, 1000)
+    # Sample market data, regenerated once per refresh bucket
+    seed = int(time.time() // CHART_REFRESH_SECONDS)
+    timestamps, mid_prices, spreads, volumes = demo_market_series(seed, 1000)
     
-    # Price chart
-    price_chart = go.Scatter(
-        x=timestamps,
-        y=mid_prices,
-        mode='lines',
-        name='Mid Price',
-        line=dict(color='blue')
-    )
+    # Plain trace/layout dicts: skips Plotly object validation, and orjson
+    # serializes the numpy arrays directly
+    price_chart = {
+        'type': 'scatter',
+        'x': timestamps,
+        'y': mid_prices,
+        'mode': 'lines',
+        'name': 'Mid Price',
+        'line': {'color': 'blue'}
+    }
     
-    # Spread chart
-    spread_chart = go.Scatter(
-        x=timestamps,
-        y=spreads,
-        mode='lines',
-        name='Bid-Ask Spread',
-        line=dict(color='red'),
-        yaxis='y2'
-    )
+    spread_chart = {
+        'type': 'scatter',
+        'x': timestamps,
+        'y': spreads,
+        'mode': 'lines',
+        'name': 'Bid-Ask Spread',
+        'line': {'color': 'red'},
+        'yaxis': 'y2'
+    }
     
-    # Volume chart
-    volume_chart = go.Bar(
-        x=timestamps,
-        y=volumes,
-        name='Volume',
-        marker=dict(color='green', opacity=0.7)
-    )
+    volume_chart = {
+        'type': 'bar',
+        'x': timestamps,
+        'y': volumes,
+        'name': 'Volume',
+        'marker': {'color': 'green', 'opacity': 0.7}
+    }
     
-    layout = go.Layout(
-        title='Market Microstructure Dashboard',
-        xaxis=dict(title='Time'),
-        yaxis=dict(title='Price', side='left'),
-        yaxis2=dict(title='Spread', side='right', overlaying='y'),
-        hovermode='x unified'
-    )
+    layout = {
+        'title': {'text': 'Market Microstructure Dashboard'},
+        'xaxis': {'title': {'text': 'Time'}},
+        'yaxis': {'title': {'text': 'Price'}, 'side': 'left'},
+        'yaxis2': {'title': {'text': 'Spread'}, 'side': 'right', 'overlaying': 'y'},
+        'hovermode': 'x unified'
+    }
     
     charts = {
         'price_spread': {
@@ -223,44 +405,31 @@ def get_charts():
         },
         'volume': {
             'data': [volume_chart],
-            'layout': go.Layout(title='Trading Volume', xaxis=dict(title='Time'), yaxis=dict(title='Volume'))
+            'layout': {
+                'title': {'text': 'Trading Volume'},
+                'xaxis': {'title': {'text': 'Time'}},
+                'yaxis': {'title': {'text': 'Volume'}}
+            }
         }
     }
     
-    return jsonify(charts)
+    response = jsonify(charts)
+    response.add_etag()
+    return response
 
 @app.route('/api/performance')
 def get_performance():
     """Get performance metrics"""
-    metrics = {
-        'cpu_usage': np.random.uniform(10, 80),
-        'memory_usage': np.random.uniform(20, 60),
-        'events_per_second': np.random.uniform(1000000, 5000000),
-        'latency_ms': np.random.uniform(0.1, 2.0)
-    }
-    return jsonify(metrics)
+    response = jsonify(dashboard_snapshots['performance'])
+    response.add_etag()
+    return response
 
 @app.route('/api/orderbook')
 def get_orderbook():
     """Get sample order book data"""
-    orderbook = {
-        'bids': [
-            {'price': 10000, 'quantity': 150},
-            {'price': 9999, 'quantity': 200},
-            {'price': 9998, 'quantity': 100}
-        ],
-        'asks': [
-            {'price': 10002, 'quantity': 120},
-            {'price': 10003, 'quantity': 180},
-            {'price': 10004, 'quantity': 90}
-        ],
-        'last_trade': {
-            'price': 10001,
-            'quantity': 50,
-            'timestamp': datetime.now().isoformat()
-        }
-    }
-    return jsonify(orderbook)
+    response = jsonify(dashboard_snapshots['orderbook'])
+    response.add_etag()
+    return response
 
 if __name__ == '__main__':
     print("🚀 Starting Market Microstructure Simulator Dashboard")
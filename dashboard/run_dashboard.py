@@ -44,9 +44,18 @@ def main():
     print("⚡ Press Ctrl+C to stop the server")
     print("=" * 50)
     
-    # Start the Flask app
-    from app import app
-    app.run(debug=False, host='0.0.0.0', port=5000)
+    # Serve the app with gunicorn's gevent worker so chart renders, status
+    # streams and simulation requests are handled concurrently. Dashboard
+    # state lives in process memory, so a single worker process is used.
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.execv(sys.executable, [
+        sys.executable, '-m', 'gunicorn',
+        '--worker-class', 'gevent',
+        '--workers', '1',
+        '--worker-connections', '1000',
+        '--bind', '0.0.0.0:5000',
+        'app:app'
+    ])
 
 if __name__ == '__main__':
     main()
@@ -4,11 +4,11 @@ Market Microstructure Simulator - Python Package
 A production-grade market microstructure simulator with C++ engine and Python bindings.
 """
 
-from .core import Simulator, SimulationConfig
+from .core import Simulator, SimulationConfig, Results
 from .core import MarketMakerConfig, TakerConfig, NoiseTraderConfig
-from .core import Side, EventType, Order, Trade, MarketSnapshot
+from .core import Side, EventType, Order, Trade, MarketSnapshot, OrderBatch
 from .strategies import SimpleStrategy, MeanReversionStrategy, MomentumStrategy
-from .utils import create_sample_agents, plot_results, save_results
+from .utils import create_sample_agents, plot_results, save_results, load_results
 
 __version__ = "1.0.0"
 __author__ = "Market Microstructure Team"
@@ -16,6 +16,7 @@ __author__ = "Market Microstructure Team"
 __all__ = [
     "Simulator",
     "SimulationConfig", 
+    "Results",
     "MarketMakerConfig",
     "TakerConfig", 
     "NoiseTraderConfig",
@@ -24,10 +25,12 @@ __all__ = [
     "Order",
     "Trade", 
     "MarketSnapshot",
+    "OrderBatch",
     "SimpleStrategy",
     "MeanReversionStrategy",
     "MomentumStrategy",
     "create_sample_agents",
     "plot_results",
-    "save_results"
+    "save_results",
+    "load_results"
 ]
@@ -0,0 +1,38 @@
+"""
+Ahead-of-time compilation of the strategy backtest kernels.
+
+Builds the ``mms.mms_kernels`` extension from _kernels.py with numba.pycc so
+installed packages run backtests without JIT warm-up. setup.py adds
+``cc.distutils_extension()`` to the build when ``MMS_BUILD_AOT=1`` is set
+and Numba is available; the module can also be compiled in place with
+``python mms/_aot_build.py``.
+
+This file is loaded by path at build time, before the package (and its C++
+extension) is importable, so it must not import from ``mms``.
+"""
+
+import importlib.util
+import os
+
+from numba.pycc import CC
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _load_kernels():
+    spec = importlib.util.spec_from_file_location("mms._kernels", os.path.join(_HERE, "_kernels.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_k = _load_kernels()
+
+cc = CC("mms_kernels")
+cc.output_dir = _HERE
+cc.export("quoting_backtest", _k.QUOTING_SIGNATURE)(_k.quoting_backtest)
+cc.export("signal_backtest", _k.SIGNAL_SIGNATURE)(_k.signal_backtest)
+
+
+if __name__ == "__main__":
+    cc.compile()
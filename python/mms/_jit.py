@@ -0,0 +1,28 @@
+"""
+Optional Numba JIT support.
+
+Numba is an optional dependency; without it ``njit`` is a no-op decorator
+and callers check ``NUMBA_AVAILABLE`` to pick their pure-Python path.
+
+For debugging, run with ``NUMBA_DISABLE_JIT=1``: ``njit`` then returns the
+plain Python functions (so breakpoints and tracebacks work inside the
+kernels).
+
+Importing this module imports numba, so callers only do so on the path that
+actually JIT-compiles.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
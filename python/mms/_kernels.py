@@ -0,0 +1,159 @@
+"""
+Backtest kernels for the built-in strategies.
+
+Plain numpy-only functions over best bid/ask arrays, each reproducing the
+generic backtest loop for one family of strategies. They start from the
+strategy's current state and return the final state so the caller can write
+it back. Per-snapshot returns are not materialized: the kernels return their
+mean, standard deviation (single-pass Welford) and number of positive returns.
+
+strategies.py uses them JIT-compiled with Numba, or precompiled by
+_aot_build.py; this module must not import anything from the package so the
+AOT build can load it on its own.
+"""
+
+import numpy as np
+
+# Last action taken by the signal strategies (strategies re-exports these)
+ACT_NONE, ACT_BUY, ACT_SELL = 0, 1, 2
+
+# Signatures for ahead-of-time compilation (see _aot_build.py)
+QUOTING_SIGNATURE = ('Tuple((f8, i8, i8, f8, f8, f8, i8, f8, f8))'
+                     '(i8[:], i8[:], i8, i8, f8, i8, f8, i8, f8, f8)')
+SIGNAL_SIGNATURE = ('Tuple((f8, i8, i8, f8, f8, f8, i8, i8, i8, f8, f8, f8, i8))'
+                    '(i8[:], i8[:], f8[:], i8, i8, f8, f8, f8, i8, b1, f8, i8, f8, i8, i8)')
+
+
+def quoting_backtest(bid, ask, offset, min_spread, requote_threshold, quantity,
+                     capital, inventory, last_bid, last_ask):
+    """
+    Two-sided quoting around the mid (SimpleStrategy / ArbitrageStrategy).
+    
+    The requote gate and last_bid / last_ask use the exact quotes (mid -/+
+    offset); the orders themselves are rounded onto the tick grid.
+    """
+    n = bid.shape[0]
+    mean_return = 0.0
+    m2 = 0.0  # sum of squared deviations from the running mean (Welford)
+    wins = 0
+    max_capital = capital
+    max_drawdown = 0.0
+    total_trades = 0
+    
+    for i in range(n):
+        b = bid[i]
+        a = ask[i]
+        if b > 0 and a > 0 and a - b >= min_spread:
+            touch_sum = b + a
+            mid = touch_sum / 2
+            bid_quote = mid - offset
+            if abs(bid_quote - last_bid) >= requote_threshold:
+                if touch_sum // 2 - offset >= a:
+                    capital -= a * quantity
+                    inventory += quantity
+                    total_trades += 1
+                last_bid = bid_quote
+            ask_quote = mid + offset
+            if abs(ask_quote - last_ask) >= requote_threshold:
+                if (touch_sum + 1) // 2 + offset <= b:
+                    capital += b * quantity
+                    inventory -= quantity
+                    total_trades += 1
+                last_ask = ask_quote
+        
+        total_value = capital + inventory * (b + a) / 2
+        r = (total_value - max_capital) / max_capital
+        delta = r - mean_return
+        mean_return += delta / (i + 1)
+        m2 += delta * (r - mean_return)
+        if r > 0:
+            wins += 1
+        if total_value > max_capital:
+            max_capital = total_value
+        drawdown = (max_capital - total_value) / max_capital
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+    
+    std_return = np.sqrt(m2 / n) if n > 0 else 0.0
+    return (capital, inventory, total_trades, max_drawdown, mean_return, std_return, wins,
+            last_bid, last_ask)
+
+
+def signal_backtest(bid, ask, buf, head, count, window_sum, sum_recent, sum_older,
+                    min_history, momentum, threshold, quantity,
+                    capital, inventory, last_action):
+    """
+    Market orders on a rolling-mean signal (MeanReversionStrategy / MomentumStrategy).
+    
+    Mirrors strategies.PriceWindowStrategy._push_price on the strategy's ring buffer,
+    which is updated in place; the scalar window state is returned.
+    """
+    n = bid.shape[0]
+    size = buf.shape[0]
+    mean_return = 0.0
+    m2 = 0.0  # sum of squared deviations from the running mean (Welford)
+    wins = 0
+    max_capital = capital
+    max_drawdown = 0.0
+    total_trades = 0
+    
+    for i in range(n):
+        b = bid[i]
+        a = ask[i]
+        if b > 0 and a > 0:
+            mid = (b + a) / 2
+            if count >= 10:
+                leaving_recent = buf[(head - 10) % size]
+                sum_recent -= leaving_recent
+                sum_older += leaving_recent
+                if count >= 20:
+                    sum_older -= buf[(head - 20) % size]
+            sum_recent += mid
+            if count == size:
+                window_sum -= buf[head]
+            else:
+                count += 1
+            window_sum += mid
+            buf[head] = mid
+            head = (head + 1) % size
+            
+            if count >= min_history:
+                if momentum:
+                    older_avg = sum_older / 10
+                    signal = (sum_recent / 10 - older_avg) / older_avg
+                    buy = signal > threshold
+                    sell = signal < -threshold
+                else:
+                    mean_price = window_sum / count
+                    signal = (mid - mean_price) / mean_price
+                    buy = signal < -threshold
+                    sell = signal > threshold
+                
+                # Market orders at the touch always execute
+                if buy and last_action != ACT_BUY:
+                    capital -= a * quantity
+                    inventory += quantity
+                    total_trades += 1
+                    last_action = ACT_BUY
+                elif sell and last_action != ACT_SELL:
+                    capital += b * quantity
+                    inventory -= quantity
+                    total_trades += 1
+                    last_action = ACT_SELL
+        
+        total_value = capital + inventory * (b + a) / 2
+        r = (total_value - max_capital) / max_capital
+        delta = r - mean_return
+        mean_return += delta / (i + 1)
+        m2 += delta * (r - mean_return)
+        if r > 0:
+            wins += 1
+        if total_value > max_capital:
+            max_capital = total_value
+        drawdown = (max_capital - total_value) / max_capital
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+    
+    std_return = np.sqrt(m2 / n) if n > 0 else 0.0
+    return (capital, inventory, total_trades, max_drawdown, mean_return, std_return, wins,
+            head, count, window_sum, sum_recent, sum_older, last_action)
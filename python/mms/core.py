@@ -8,6 +8,32 @@ from typing import Dict, List, Optional, Tuple, Any
 import mms_core as core
 
 
+# Structured dtypes for simulation results.
+# Trade and snapshot dtypes mirror the memory layout of the C++ structs
+# (explicit offsets), so result buffers can be viewed without copying.
+TRADE_DTYPE = np.dtype({
+    'names': ['timestamp', 'maker_id', 'taker_id', 'price', 'quantity'],
+    'formats': ['i8', 'u8', 'u8', 'i8', 'i8'],
+    'offsets': [32, 0, 8, 16, 24],
+    'itemsize': 40
+})
+
+SNAPSHOT_DTYPE = np.dtype({
+    'names': ['timestamp', 'best_bid', 'best_ask', 'best_bid_qty', 'best_ask_qty',
+              'last_trade_price'],
+    'formats': ['i8', 'i8', 'i8', 'i8', 'i8', 'i8'],
+    'offsets': [40, 0, 8, 16, 24, 32],
+    'itemsize': 48
+})
+
+PNL_DTYPE = np.dtype([
+    ('timestamp', 'i8'),
+    ('agent_id', 'u8'),
+    ('pnl', 'f8'),
+    ('inventory', 'i8')
+])
+
+
 class SimulationConfig:
     """Configuration for market microstructure simulation."""
     
@@ -25,6 +51,29 @@ class SimulationConfig:
         self.config.max_steps = max_steps
         self.config.enable_logging = enable_logging
         self.config.output_dir = output_dir
+    
+    @property
+    def seed_seq(self) -> np.random.SeedSequence:
+        """SeedSequence rooted at this config's seed."""
+        return np.random.SeedSequence(self.config.seed)
+    
+    def spawn(self, n: int) -> List['SimulationConfig']:
+        """
+        Copies of this config for n statistically independent runs.
+        
+        Each seed is drawn from a child of seed_seq.spawn(n), so repeated or
+        parallel runs get unrelated engine streams instead of neighbouring
+        integer seeds, and the set of runs is reproducible from one seed.
+        """
+        return [
+            SimulationConfig(seed=int(child.generate_state(1, np.uint64)[0]),
+                             start_time=self.config.start_time,
+                             time_step=self.config.time_step,
+                             max_steps=self.config.max_steps,
+                             enable_logging=self.config.enable_logging,
+                             output_dir=self.config.output_dir)
+            for child in self.seed_seq.spawn(n)
+        ]
 
 
 class MarketMakerConfig:
@@ -92,7 +141,7 @@ class Simulator:
             n_steps: int,
             maker_config: Optional[MarketMakerConfig] = None,
             taker_config: Optional[TakerConfig] = None,
-            noise_config: Optional[NoiseTraderConfig] = None) -> Dict[str, np.ndarray]:
+            noise_config: Optional[NoiseTraderConfig] = None) -> 'Results':
         """
         Run simulation and return results as pandas-compatible numpy arrays.
         
@@ -121,67 +170,44 @@ class Simulator:
         
         return self._convert_result_to_arrays(result)
     
-    def _convert_result_to_arrays(self, result: core.RunResult) -> Dict[str, np.ndarray]:
+    def _convert_result_to_arrays(self, result: core.RunResult) -> 'Results':
         """Convert C++ result to numpy arrays."""
         
-        # Convert trades
-        trades_data = []
-        for trade in result.trades:
-            trades_data.append([
-                trade.timestamp,
-                trade.maker_id,
-                trade.taker_id,
-                trade.price,
-                trade.quantity
-            ])
-        
-        trades_array = np.array(trades_data, dtype=[
-            ('timestamp', 'i8'),
-            ('maker_id', 'u8'),
-            ('taker_id', 'u8'),
-            ('price', 'i8'),
-            ('quantity', 'i8')
-        ])
-        
-        # Convert market snapshots
-        snapshots_data = []
-        for snapshot in result.market_snapshots:
-            snapshots_data.append([
-                snapshot.timestamp,
-                snapshot.best_bid,
-                snapshot.best_ask,
-                snapshot.best_bid_qty,
-                snapshot.best_ask_qty,
-                snapshot.last_trade_price
-            ])
-        
-        snapshots_array = np.array(snapshots_data, dtype=[
-            ('timestamp', 'i8'),
-            ('best_bid', 'i8'),
-            ('best_ask', 'i8'),
-            ('best_bid_qty', 'i8'),
-            ('best_ask_qty', 'i8'),
-            ('last_trade_price', 'i8')
-        ])
-        
-        # Convert agent PnL
-        pnl_data = []
-        for agent_id, timestamp, pnl, inventory in result.agent_pnl:
-            pnl_data.append([
-                timestamp,
-                agent_id,
-                pnl,
-                inventory
-            ])
-        
-        pnl_array = np.array(pnl_data, dtype=[
-            ('timestamp', 'i8'),
-            ('agent_id', 'u8'),
-            ('pnl', 'f8'),
-            ('inventory', 'i8')
-        ])
+        if hasattr(result, 'trades_view'):
+            # Zero-copy views over the C++ trade and snapshot buffers
+            trades_array = np.asarray(result.trades_view).view(TRADE_DTYPE)
+            snapshots_array = np.asarray(result.market_snapshots_view).view(SNAPSHOT_DTYPE)
+            
+            # Agent PnL is packed into flat records on the C++ side
+            pnl_array = np.asarray(result.agent_pnl_view).view(PNL_DTYPE)
+        else:
+            # Extension built without buffer views: stream records into
+            # preallocated arrays (no intermediate lists or dtype inference)
+            trades = result.trades
+            trades_array = np.fromiter(
+                ((t.timestamp, t.maker_id, t.taker_id, t.price, t.quantity) for t in trades),
+                dtype=TRADE_DTYPE,
+                count=len(trades)
+            )
+            
+            snapshots = result.market_snapshots
+            snapshots_array = np.fromiter(
+                ((s.timestamp, s.best_bid, s.best_ask, s.best_bid_qty, s.best_ask_qty,
+                  s.last_trade_price) for s in snapshots),
+                dtype=SNAPSHOT_DTYPE,
+                count=len(snapshots)
+            )
+            
+            # C++ tuples are (agent_id, timestamp, pnl, inventory)
+            agent_pnl = result.agent_pnl
+            pnl_array = np.fromiter(
+                ((timestamp, agent_id, pnl, inventory)
+                 for agent_id, timestamp, pnl, inventory in agent_pnl),
+                dtype=PNL_DTYPE,
+                count=len(agent_pnl)
+            )
         
-        return {
+        return Results({
             'trades': trades_array,
             'market_snapshots': snapshots_array,
             'agent_pnl': pnl_array,
@@ -189,7 +215,7 @@ class Simulator:
             'total_trades': np.array([result.total_trades]),
             'simulation_duration': np.array([result.simulation_duration]),
             'simulation_time_seconds': np.array([result.simulation_time_seconds])
-        }
+        })
 
 
 # Re-export core types for convenience
@@ -200,46 +226,211 @@ Trade = core.Trade
 MarketSnapshot = core.MarketSnapshot
 
 
+class OrderBatch:
+    """
+    Growable structure-of-arrays buffer of orders.
+    
+    Strategies push orders here instead of allocating Order objects; the
+    filled part of each column is exposed as a numpy view.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._sides = np.empty(capacity, dtype=np.int8)
+        self._prices = np.empty(capacity, dtype=np.int64)
+        self._qtys = np.empty(capacity, dtype=np.int32)
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._n = 0
+    
+    def push(self, order_id: int, side: Side, price: int, quantity: int, timestamp: int):
+        """Append one order, doubling the buffers when full."""
+        n = self._n
+        if n == len(self._ids):
+            self._grow(max(2 * n, 16))
+        self._ids[n] = order_id
+        self._sides[n] = int(side)
+        self._prices[n] = price
+        self._qtys[n] = quantity
+        self._ts[n] = timestamp
+        self._n = n + 1
+    
+    def clear(self):
+        """Drop all orders, keeping the allocated buffers."""
+        self._n = 0
+    
+    def _grow(self, capacity: int):
+        for name in ('_ids', '_sides', '_prices', '_qtys', '_ts'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._n]
+    
+    @property
+    def sides(self) -> np.ndarray:
+        return self._sides[:self._n]
+    
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[:self._n]
+    
+    @property
+    def qtys(self) -> np.ndarray:
+        return self._qtys[:self._n]
+    
+    @property
+    def ts(self) -> np.ndarray:
+        return self._ts[:self._n]
+    
+    def to_orders(self) -> List[Order]:
+        """Materialize the batch as core Order objects (e.g. to submit to the engine)."""
+        return [Order(int(i), Side(int(s)), int(p), int(q), int(t))
+                for i, s, p, q, t in zip(self.ids, self.sides, self.prices, self.qtys, self.ts)]
+
+
+def _frame(arr: np.ndarray) -> pd.DataFrame:
+    """DataFrame whose columns are zero-copy views of a structured array's fields."""
+    return pd.DataFrame({name: arr[name] for name in arr.dtype.names}, copy=False)
+
+
 def create_dataframes(result_dict: Dict[str, np.ndarray]) -> Dict[str, pd.DataFrame]:
-    """Convert numpy arrays to pandas DataFrames."""
+    """
+    Convert numpy arrays to pandas DataFrames.
+    
+    Convenience for interactive analysis; calculate_statistics and the
+    simulator itself work on the structured arrays and never need this.
+    
+    The columns alias the fields of the result arrays rather than copying
+    them, so treat the DataFrames as read-only: writing into them in place
+    also modifies the arrays. Call .copy() on a DataFrame to edit it.
+    """
     return {
-        'trades': pd.DataFrame(result_dict['trades']),
-        'market_snapshots': pd.DataFrame(result_dict['market_snapshots']),
-        'agent_pnl': pd.DataFrame(result_dict['agent_pnl'])
+        'trades': _frame(result_dict['trades']),
+        'market_snapshots': _frame(result_dict['market_snapshots']),
+        'agent_pnl': _frame(result_dict['agent_pnl'])
     }
 
 
-def calculate_statistics(dfs: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
-    """Calculate basic statistics from simulation results."""
+class Results(dict):
+    """
+    Simulation results: a dict of numpy arrays, as returned by Simulator.run().
+    
+    The DataFrame view is built once on first access to `dfs` and shared by
+    every consumer (e.g. plot_results), instead of each one converting the
+    arrays again. It is not rebuilt if the arrays are replaced afterwards.
+    """
+    
+    @property
+    def dfs(self) -> Dict[str, pd.DataFrame]:
+        """DataFrames for trades, market snapshots and agent PnL (cached)."""
+        dfs = self.__dict__.get('_dfs')
+        if dfs is None:
+            dfs = self._dfs = create_dataframes(self)
+        return dfs
+
+
+def _dataframes(result_dict: Dict[str, np.ndarray]) -> Dict[str, pd.DataFrame]:
+    """DataFrames for a result dict, reusing the cached ones of a Results."""
+    if isinstance(result_dict, Results):
+        return result_dict.dfs
+    return create_dataframes(result_dict)
+
+
+def _agent_segments(agent_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group records by agent with a single stable sort.
+    
+    Returns:
+        Tuple of (order, starts, ends): the permutation that sorts records by
+        agent (preserving time order within each agent) and the start/end
+        offsets of each agent's segment in the sorted order
+    """
+    agent_ids = np.asarray(agent_ids)
+    order = np.argsort(agent_ids, kind='stable')
+    sorted_ids = agent_ids[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_ids)) + 1))
+    ends = np.append(starts[1:], len(sorted_ids))
+    return order, starts, ends
+
+
+def _quote_stats(best_bid: np.ndarray, best_ask: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Average spread, average mid price and mid-price volatility in one sweep.
+    
+    Both means come from exact integer sums of the quotes; the volatility
+    reuses a single float buffer of centered mid prices (sample std, ddof=1).
+    """
+    best_bid = np.asarray(best_bid)
+    best_ask = np.asarray(best_ask)
+    n = len(best_bid)
+    bid_sum = best_bid.sum()
+    ask_sum = best_ask.sum()
+    
+    avg_spread = (ask_sum - bid_sum) / n
+    avg_mid_price = (ask_sum + bid_sum) / (2 * n)
+    if n < 2:
+        return avg_spread, avg_mid_price, np.nan
+    
+    # Work on 2*mid to skip the halving pass; the 0.5 factor is applied once
+    deviations = np.add(best_bid, best_ask, dtype=np.float64)
+    deviations -= 2 * avg_mid_price
+    price_volatility = 0.5 * np.sqrt(np.dot(deviations, deviations) / (n - 1))
+    return avg_spread, avg_mid_price, price_volatility
+
+
+def calculate_statistics(arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Calculate basic statistics from simulation results.
+    
+    Args:
+        arrays: Structured arrays from simulator.run() (DataFrames with the
+            same columns are also accepted)
+        
+    Returns:
+        Dictionary of summary statistics
+    """
     stats = {}
     
-    if 'trades' in dfs and not dfs['trades'].empty:
-        trades = dfs['trades']
+    trades = arrays.get('trades')
+    if trades is not None and len(trades) > 0:
+        price = np.asarray(trades['price'])
+        quantity = np.asarray(trades['quantity'])
         stats['total_trades'] = len(trades)
-        stats['total_volume'] = trades['quantity'].sum()
-        stats['vwap'] = (trades['price'] * trades['quantity']).sum() / trades['quantity'].sum()
-        stats['price_range'] = (trades['price'].max(), trades['price'].min())
-    
-    if 'market_snapshots' in dfs and not dfs['market_snapshots'].empty:
-        snapshots = dfs['market_snapshots']
-        # Calculate mid prices
-        snapshots['mid_price'] = (snapshots['best_bid'] + snapshots['best_ask']) / 2
-        snapshots['spread'] = snapshots['best_ask'] - snapshots['best_bid']
+        stats['total_volume'] = quantity.sum()
+        stats['vwap'] = np.dot(price, quantity) / stats['total_volume']
+        stats['price_range'] = (price.max(), price.min())
+    
+    snapshots = arrays.get('market_snapshots')
+    if snapshots is not None and len(snapshots) > 0:
+        (stats['avg_spread'], stats['avg_mid_price'],
+         stats['price_volatility']) = _quote_stats(snapshots['best_bid'], snapshots['best_ask'])
+    
+    pnl = arrays.get('agent_pnl')
+    if pnl is not None and len(pnl) > 0:
+        order, starts, ends = _agent_segments(pnl['agent_id'])
+        sorted_ids = np.asarray(pnl['agent_id'])[order]
+        sorted_pnl = np.asarray(pnl['pnl'])[order]
+        sorted_inventory = np.asarray(pnl['inventory'])[order]
+        
+        max_pnl = np.maximum.reduceat(sorted_pnl, starts)
+        min_pnl = np.minimum.reduceat(sorted_pnl, starts)
+        final_pnl = sorted_pnl[ends - 1]
+        final_inventory = sorted_inventory[ends - 1]
         
-        stats['avg_spread'] = snapshots['spread'].mean()
-        stats['avg_mid_price'] = snapshots['mid_price'].mean()
-        stats['price_volatility'] = snapshots['mid_price'].std()
-    
-    if 'agent_pnl' in dfs and not dfs['agent_pnl'].empty:
-        pnl = dfs['agent_pnl']
-        stats['agent_performance'] = {}
-        for agent_id in pnl['agent_id'].unique():
-            agent_data = pnl[pnl['agent_id'] == agent_id]
-            stats['agent_performance'][agent_id] = {
-                'final_pnl': agent_data['pnl'].iloc[-1] if len(agent_data) > 0 else 0,
-                'final_inventory': agent_data['inventory'].iloc[-1] if len(agent_data) > 0 else 0,
-                'max_pnl': agent_data['pnl'].max(),
-                'min_pnl': agent_data['pnl'].min()
+        stats['agent_performance'] = {
+            agent_id: {
+                'final_pnl': final_pnl[i],
+                'final_inventory': final_inventory[i],
+                'max_pnl': max_pnl[i],
+                'min_pnl': min_pnl[i]
             }
+            for i, agent_id in enumerate(sorted_ids[starts])
+        }
     
     return stats
@@ -2,9 +2,33 @@
 Example trading strategies for the market microstructure simulator.
 """
 
+import os
 import numpy as np
-from typing import List, Dict, Any, Optional
-from .core import Order, Trade, MarketSnapshot, Side, EventType
+from typing import List, Dict, Any, Optional, Tuple
+from .core import OrderBatch, Trade, MarketSnapshot, Side, EventType
+from . import _kernels
+from ._kernels import ACT_NONE, ACT_BUY, ACT_SELL
+
+# Compiled backtest kernels: prefer the ahead-of-time build shipped with the
+# package (no JIT warm-up, and numba is never imported), then Numba JIT;
+# without either, backtests use the numpy implementations below.
+# NUMBA_DISABLE_JIT=1 bypasses the AOT build so the kernels run as plain Python.
+try:
+    if os.environ.get("NUMBA_DISABLE_JIT", "0").strip() not in ("", "0"):
+        raise ImportError("NUMBA_DISABLE_JIT is set")
+    from . import mms_kernels as _compiled_kernels
+except ImportError:
+    _compiled_kernels = None
+
+if _compiled_kernels is not None:
+    KERNELS_AVAILABLE = True
+    _quoting_kernel = _compiled_kernels.quoting_backtest
+    _signal_kernel = _compiled_kernels.signal_backtest
+else:
+    from ._jit import njit, NUMBA_AVAILABLE
+    KERNELS_AVAILABLE = NUMBA_AVAILABLE
+    _quoting_kernel = njit(cache=True)(_kernels.quoting_backtest)
+    _signal_kernel = njit(cache=True)(_kernels.signal_backtest)
 
 
 class BaseStrategy:
@@ -17,8 +41,13 @@ class BaseStrategy:
         self.inventory = 0
         self.trades = []
     
-    def update(self, timestamp: int, market_snapshot: MarketSnapshot) -> List[Order]:
-        """Update strategy and return new orders."""
+    def update(self, timestamp: int, market_snapshot: MarketSnapshot, batch: OrderBatch):
+        """
+        Update strategy and push any new orders onto `batch`.
+        
+        The batch is owned by the caller and reused across ticks (it may
+        already hold earlier orders); strategies only append to it.
+        """
         raise NotImplementedError
     
     def on_trade(self, trade: Trade):
@@ -58,205 +87,196 @@ class SimpleStrategy(BaseStrategy):
     """Simple market making strategy."""
     
     def __init__(self, strategy_id: int, name: str = "SimpleStrategy", 
-                 spread: int = 2, quantity: int = 50):
+                 spread: int = 2, quantity: int = 50, requote_threshold: float = 0.5):
         super().__init__(strategy_id, name)
         self.spread = spread
         self.quantity = quantity
+        # Minimum move of a side's quote (in ticks) before it is requoted; quotes
+        # are offsets from the mid and move in half ticks, so the default
+        # requotes on every move
+        self.requote_threshold = requote_threshold
         self.last_bid = 0
         self.last_ask = 0
     
-    def update(self, timestamp: int, market_snapshot: MarketSnapshot) -> List[Order]:
-        orders = []
-        
+    def update(self, timestamp: int, market_snapshot: MarketSnapshot, batch: OrderBatch):
         if market_snapshot.best_bid > 0 and market_snapshot.best_ask > 0:
-            mid_price = (market_snapshot.best_bid + market_snapshot.best_ask) / 2
+            # The requote gate compares exact quotes around the mid; orders go on
+            # the tick grid (bid rounded down, ask up), which against integer
+            # touch prices fills exactly when the exact quote would
+            touch_sum = market_snapshot.best_bid + market_snapshot.best_ask
+            mid_price = touch_sum / 2
             
             # Place bid order
-            bid_price = mid_price - self.spread // 2
-            if bid_price != self.last_bid:
-                orders.append(Order(
-                    id=timestamp + self.id,
-                    side=Side.BUY,
-                    price=bid_price,
-                    quantity=self.quantity,
-                    timestamp=timestamp
-                ))
-                self.last_bid = bid_price
+            bid_quote = mid_price - self.spread // 2
+            if abs(bid_quote - self.last_bid) >= self.requote_threshold:
+                bid_price = touch_sum // 2 - self.spread // 2
+                batch.push(timestamp + self.id, Side.BUY, bid_price, self.quantity, timestamp)
+                self.last_bid = bid_quote
             
             # Place ask order
-            ask_price = mid_price + self.spread // 2
-            if ask_price != self.last_ask:
-                orders.append(Order(
-                    id=timestamp + self.id + 1000,
-                    side=Side.SELL,
-                    price=ask_price,
-                    quantity=self.quantity,
-                    timestamp=timestamp
-                ))
-                self.last_ask = ask_price
+            ask_quote = mid_price + self.spread // 2
+            if abs(ask_quote - self.last_ask) >= self.requote_threshold:
+                ask_price = (touch_sum + 1) // 2 + self.spread // 2
+                batch.push(timestamp + self.id + 1000, Side.SELL, ask_price, self.quantity, timestamp)
+                self.last_ask = ask_quote
+
+
+class PriceWindowStrategy(BaseStrategy):
+    """
+    Base class for strategies driven by a rolling window of mid prices.
+    
+    Prices are kept in a fixed-size ring buffer with running sums of the
+    whole window and of the last two 10-tick blocks, so each update is O(1).
+    """
+    
+    def __init__(self, strategy_id: int, name: str, lookback_period: int):
+        super().__init__(strategy_id, name)
+        self.lookback_period = lookback_period
+        self._buf = np.empty(lookback_period, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_recent = 0.0  # last 10 prices
+        self._sum_older = 0.0   # the 10 prices before those
+    
+    @property
+    def price_history(self) -> np.ndarray:
+        """Prices currently in the window, oldest first."""
+        if self._count < self.lookback_period:
+            return self._buf[:self._count].copy()
+        return np.concatenate((self._buf[self._head:], self._buf[:self._head]))
+    
+    def _push_price(self, price: float):
+        """Append a price to the window, evicting the oldest when full."""
+        buf, head, count, size = self._buf, self._head, self._count, self.lookback_period
         
-        return orders
+        # Prices leaving the 10-tick blocks (read before the slot is overwritten)
+        if count >= 10:
+            leaving_recent = buf[head - 10]
+            self._sum_recent -= leaving_recent
+            self._sum_older += leaving_recent
+            if count >= 20:
+                self._sum_older -= buf[head - 20]
+        self._sum_recent += price
+        
+        if count == size:
+            self._sum -= buf[head]
+        else:
+            self._count = count + 1
+        self._sum += price
+        
+        buf[head] = price
+        self._head = (head + 1) % size
 
 
-class MeanReversionStrategy(BaseStrategy):
+class MeanReversionStrategy(PriceWindowStrategy):
     """Mean reversion strategy based on price deviations."""
     
     def __init__(self, strategy_id: int, name: str = "MeanReversionStrategy",
                  lookback_period: int = 100, threshold: float = 0.02,
                  quantity: int = 30):
-        super().__init__(strategy_id, name)
-        self.lookback_period = lookback_period
+        super().__init__(strategy_id, name, lookback_period)
         self.threshold = threshold
         self.quantity = quantity
-        self.price_history = []
-        self.last_action = None
+        self.last_action = ACT_NONE
     
-    def update(self, timestamp: int, market_snapshot: MarketSnapshot) -> List[Order]:
-        orders = []
-        
+    def update(self, timestamp: int, market_snapshot: MarketSnapshot, batch: OrderBatch):
         if market_snapshot.best_bid > 0 and market_snapshot.best_ask > 0:
-            mid_price = (market_snapshot.best_bid + market_snapshot.best_ask) / 2
-            self.price_history.append(mid_price)
+            mid_price = market_snapshot.mid_price
+            self._push_price(mid_price)
             
-            # Keep only recent prices
-            if len(self.price_history) > self.lookback_period:
-                self.price_history = self.price_history[-self.lookback_period:]
-            
-            if len(self.price_history) >= 10:
-                mean_price = np.mean(self.price_history)
+            if self._count >= 10:
+                mean_price = self._sum / self._count
                 current_deviation = (mid_price - mean_price) / mean_price
                 
                 # Buy if price is below mean (oversold)
-                if current_deviation < -self.threshold and self.last_action != 'buy':
-                    orders.append(Order(
-                        id=timestamp + self.id,
-                        side=Side.BUY,
-                        price=market_snapshot.best_ask,  # Market buy
-                        quantity=self.quantity,
-                        timestamp=timestamp
-                    ))
-                    self.last_action = 'buy'
+                if current_deviation < -self.threshold and self.last_action != ACT_BUY:
+                    batch.push(timestamp + self.id, Side.BUY,
+                               market_snapshot.best_ask,  # Market buy
+                               self.quantity, timestamp)
+                    self.last_action = ACT_BUY
                 
                 # Sell if price is above mean (overbought)
-                elif current_deviation > self.threshold and self.last_action != 'sell':
-                    orders.append(Order(
-                        id=timestamp + self.id + 1000,
-                        side=Side.SELL,
-                        price=market_snapshot.best_bid,  # Market sell
-                        quantity=self.quantity,
-                        timestamp=timestamp
-                    ))
-                    self.last_action = 'sell'
-        
-        return orders
+                elif current_deviation > self.threshold and self.last_action != ACT_SELL:
+                    batch.push(timestamp + self.id + 1000, Side.SELL,
+                               market_snapshot.best_bid,  # Market sell
+                               self.quantity, timestamp)
+                    self.last_action = ACT_SELL
 
 
-class MomentumStrategy(BaseStrategy):
+class MomentumStrategy(PriceWindowStrategy):
     """Momentum strategy based on price trends."""
     
     def __init__(self, strategy_id: int, name: str = "MomentumStrategy",
                  lookback_period: int = 50, momentum_threshold: float = 0.01,
                  quantity: int = 40):
-        super().__init__(strategy_id, name)
-        self.lookback_period = lookback_period
+        super().__init__(strategy_id, name, lookback_period)
         self.momentum_threshold = momentum_threshold
         self.quantity = quantity
-        self.price_history = []
-        self.last_action = None
+        self.last_action = ACT_NONE
     
-    def update(self, timestamp: int, market_snapshot: MarketSnapshot) -> List[Order]:
-        orders = []
-        
+    def update(self, timestamp: int, market_snapshot: MarketSnapshot, batch: OrderBatch):
         if market_snapshot.best_bid > 0 and market_snapshot.best_ask > 0:
-            mid_price = (market_snapshot.best_bid + market_snapshot.best_ask) / 2
-            self.price_history.append(mid_price)
+            mid_price = market_snapshot.mid_price
+            self._push_price(mid_price)
             
-            # Keep only recent prices
-            if len(self.price_history) > self.lookback_period:
-                self.price_history = self.price_history[-self.lookback_period:]
-            
-            if len(self.price_history) >= 20:
+            if self._count >= 20:
                 # Calculate momentum
-                recent_prices = self.price_history[-10:]
-                older_prices = self.price_history[-20:-10]
+                recent_avg = self._sum_recent / 10
+                older_avg = self._sum_older / 10
+                momentum = (recent_avg - older_avg) / older_avg
                 
-                if len(recent_prices) > 0 and len(older_prices) > 0:
-                    recent_avg = np.mean(recent_prices)
-                    older_avg = np.mean(older_prices)
-                    momentum = (recent_avg - older_avg) / older_avg
-                    
-                    # Buy on positive momentum
-                    if momentum > self.momentum_threshold and self.last_action != 'buy':
-                        orders.append(Order(
-                            id=timestamp + self.id,
-                            side=Side.BUY,
-                            price=market_snapshot.best_ask,  # Market buy
-                            quantity=self.quantity,
-                            timestamp=timestamp
-                        ))
-                        self.last_action = 'buy'
-                    
-                    # Sell on negative momentum
-                    elif momentum < -self.momentum_threshold and self.last_action != 'sell':
-                        orders.append(Order(
-                            id=timestamp + self.id + 1000,
-                            side=Side.SELL,
-                            price=market_snapshot.best_bid,  # Market sell
-                            quantity=self.quantity,
-                            timestamp=timestamp
-                        ))
-                        self.last_action = 'sell'
-        
-        return orders
+                # Buy on positive momentum
+                if momentum > self.momentum_threshold and self.last_action != ACT_BUY:
+                    batch.push(timestamp + self.id, Side.BUY,
+                               market_snapshot.best_ask,  # Market buy
+                               self.quantity, timestamp)
+                    self.last_action = ACT_BUY
+                
+                # Sell on negative momentum
+                elif momentum < -self.momentum_threshold and self.last_action != ACT_SELL:
+                    batch.push(timestamp + self.id + 1000, Side.SELL,
+                               market_snapshot.best_bid,  # Market sell
+                               self.quantity, timestamp)
+                    self.last_action = ACT_SELL
 
 
 class ArbitrageStrategy(BaseStrategy):
     """Simple arbitrage strategy looking for price discrepancies."""
     
     def __init__(self, strategy_id: int, name: str = "ArbitrageStrategy",
-                 min_spread: int = 1, quantity: int = 25):
+                 min_spread: int = 1, quantity: int = 25, requote_threshold: float = 0.5):
         super().__init__(strategy_id, name)
         self.min_spread = min_spread
         self.quantity = quantity
+        # Minimum move of a side's quote (in ticks) before it is requoted (see
+        # SimpleStrategy)
+        self.requote_threshold = requote_threshold
         self.last_bid = 0
         self.last_ask = 0
     
-    def update(self, timestamp: int, market_snapshot: MarketSnapshot) -> List[Order]:
-        orders = []
-        
+    def update(self, timestamp: int, market_snapshot: MarketSnapshot, batch: OrderBatch):
         if market_snapshot.best_bid > 0 and market_snapshot.best_ask > 0:
             spread = market_snapshot.best_ask - market_snapshot.best_bid
             
             # Only trade if spread is wide enough
             if spread >= self.min_spread:
-                mid_price = (market_snapshot.best_bid + market_snapshot.best_ask) / 2
+                touch_sum = market_snapshot.best_bid + market_snapshot.best_ask
+                mid_price = touch_sum / 2
                 
-                # Place orders inside the spread
-                bid_price = mid_price - 1
-                ask_price = mid_price + 1
+                # Place orders inside the spread (exact quotes gate, orders on the tick grid)
+                bid_quote = mid_price - 1
+                ask_quote = mid_price + 1
                 
-                # Only place if prices have changed
-                if bid_price != self.last_bid:
-                    orders.append(Order(
-                        id=timestamp + self.id,
-                        side=Side.BUY,
-                        price=bid_price,
-                        quantity=self.quantity,
-                        timestamp=timestamp
-                    ))
-                    self.last_bid = bid_price
+                # Only place if prices have moved enough
+                if abs(bid_quote - self.last_bid) >= self.requote_threshold:
+                    batch.push(timestamp + self.id, Side.BUY, touch_sum // 2 - 1, self.quantity, timestamp)
+                    self.last_bid = bid_quote
                 
-                if ask_price != self.last_ask:
-                    orders.append(Order(
-                        id=timestamp + self.id + 1000,
-                        side=Side.SELL,
-                        price=ask_price,
-                        quantity=self.quantity,
-                        timestamp=timestamp
-                    ))
-                    self.last_ask = ask_price
-        
-        return orders
+                if abs(ask_quote - self.last_ask) >= self.requote_threshold:
+                    batch.push(timestamp + self.id + 1000, Side.SELL, (touch_sum + 1) // 2 + 1,
+                               self.quantity, timestamp)
+                    self.last_ask = ask_quote
 
 
 def create_sample_strategies() -> List[BaseStrategy]:
@@ -274,7 +294,52 @@ def backtest_strategy(strategy: BaseStrategy,
                      market_data: List[MarketSnapshot],
                      start_capital: float = 10000.0) -> Dict[str, Any]:
     """Simple backtest for a strategy against market data."""
-    results = {
+    results = _empty_backtest_results(strategy)
+    
+    if KERNELS_AVAILABLE and type(strategy) in _BACKTEST_KERNELS:
+        capital, return_stats = _BACKTEST_KERNELS[type(strategy)](strategy, market_data,
+                                                                 start_capital, results)
+    elif type(strategy) in _QUOTING_STRATEGIES:
+        bid, ask = _quote_arrays(market_data)
+        capital, return_stats = _backtest_quoting_vectorized(strategy, bid, ask, start_capital, results)
+    else:
+        capital, return_stats = _backtest_python(strategy, market_data, start_capital, results)
+    
+    return _finalize_backtest(results, strategy, capital, start_capital, return_stats)
+
+
+def vectorized_backtest(strategy: BaseStrategy,
+                        bid_arr: np.ndarray,
+                        ask_arr: np.ndarray,
+                        start_capital: float = 10000.0) -> Dict[str, Any]:
+    """
+    Backtest a quoting strategy directly on best bid/ask arrays.
+    
+    SimpleStrategy and ArbitrageStrategy quote a fixed function of (bid, ask),
+    so the whole run reduces to array operations. Results match
+    backtest_strategy on the equivalent snapshots.
+    
+    Args:
+        strategy: SimpleStrategy or ArbitrageStrategy
+        bid_arr: Best bid per snapshot (e.g. result['market_snapshots']['best_bid'])
+        ask_arr: Best ask per snapshot
+        start_capital: Initial capital
+        
+    Returns:
+        Backtest results, as returned by backtest_strategy
+    """
+    if type(strategy) not in _QUOTING_STRATEGIES:
+        raise TypeError(f"vectorized_backtest does not support {type(strategy).__name__}")
+    
+    results = _empty_backtest_results(strategy)
+    bid = np.asarray(bid_arr, dtype=np.int64)
+    ask = np.asarray(ask_arr, dtype=np.int64)
+    capital, return_stats = _backtest_quoting_vectorized(strategy, bid, ask, start_capital, results)
+    return _finalize_backtest(results, strategy, capital, start_capital, return_stats)
+
+
+def _empty_backtest_results(strategy: BaseStrategy) -> Dict[str, Any]:
+    return {
         'strategy_name': strategy.name,
         'total_trades': 0,
         'pnl': 0.0,
@@ -283,53 +348,239 @@ def backtest_strategy(strategy: BaseStrategy,
         'sharpe_ratio': 0.0,
         'win_rate': 0.0
     }
+
+
+def _finalize_backtest(results: Dict[str, Any], strategy: BaseStrategy, capital: float,
+                       start_capital: float,
+                       return_stats: Tuple[int, float, float, int]) -> Dict[str, Any]:
+    # Calculate final statistics
+    results['pnl'] = capital - start_capital
+    results['final_inventory'] = strategy.inventory
+    
+    n_returns, mean_return, std_return, positive_returns = return_stats
+    if n_returns > 1 and std_return > 0:
+        results['sharpe_ratio'] = mean_return / std_return
+    
+    # Calculate win rate (simplified)
+    results['win_rate'] = positive_returns / n_returns if n_returns else 0.0
+    
+    return results
+
+
+def _return_stats(returns: np.ndarray) -> Tuple[int, float, float, int]:
+    """Summarize per-snapshot returns as (count, mean, std, number of positive returns)."""
+    if len(returns) == 0:
+        return 0, 0.0, 0.0, 0
+    return (len(returns), np.mean(returns), np.std(returns),
+            int(np.count_nonzero(returns > 0)))
+
+
+def _backtest_python(strategy: BaseStrategy,
+                     market_data: List[MarketSnapshot],
+                     start_capital: float,
+                     results: Dict[str, Any]) -> Tuple[float, np.ndarray]:
+    """
+    Generic backtest driving strategy.update() per snapshot.
     
+    Each snapshot's orders are filled before the next update(), so strategies
+    that read their own inventory see every earlier fill. Drawdown and returns
+    are then computed from the per-snapshot capital and inventory in one pass.
+    """
+    n = len(market_data)
+    batch = OrderBatch(capacity=16)
+    capital_path = np.empty(n, dtype=np.float64)
+    inventory_path = np.empty(n, dtype=np.int64)
     capital = start_capital
-    max_capital = start_capital
-    returns = []
+    total_trades = 0
+    buy, sell = int(Side.BUY), int(Side.SELL)
     
-    for snapshot in market_data:
+    for i, snapshot in enumerate(market_data):
         # Update strategy
-        orders = strategy.update(snapshot.timestamp, snapshot)
-        
-        # Simulate order execution (simplified)
-        for order in orders:
-            if order.side == Side.BUY and order.price >= snapshot.best_ask:
-                # Buy order executed
-                trade_price = snapshot.best_ask
-                capital -= trade_price * order.quantity
-                strategy.inventory += order.quantity
-                results['total_trades'] += 1
-            elif order.side == Side.SELL and order.price <= snapshot.best_bid:
-                # Sell order executed
-                trade_price = snapshot.best_bid
-                capital += trade_price * order.quantity
-                strategy.inventory -= order.quantity
-                results['total_trades'] += 1
+        batch.clear()
+        strategy.update(snapshot.timestamp, snapshot, batch)
         
-        # Track performance
-        total_value = capital + strategy.inventory * (snapshot.best_bid + snapshot.best_ask) / 2
-        returns.append((total_value - max_capital) / max_capital)
+        # Simulate order execution (simplified): marketable orders fill at the touch
+        if len(batch):
+            best_bid, best_ask = snapshot.best_bid, snapshot.best_ask
+            for side, price, qty in zip(batch.sides.tolist(), batch.prices.tolist(),
+                                        batch.qtys.tolist()):
+                if side == buy and price >= best_ask:
+                    capital -= best_ask * qty
+                    strategy.inventory += qty
+                    total_trades += 1
+                elif side == sell and price <= best_bid:
+                    capital += best_bid * qty
+                    strategy.inventory -= qty
+                    total_trades += 1
         
-        if total_value > max_capital:
-            max_capital = total_value
-        
-        drawdown = (max_capital - total_value) / max_capital
-        if drawdown > results['max_drawdown']:
-            results['max_drawdown'] = drawdown
+        capital_path[i] = capital
+        inventory_path[i] = strategy.inventory
     
-    # Calculate final statistics
-    results['pnl'] = capital - start_capital
-    results['final_inventory'] = strategy.inventory
+    results['total_trades'] = total_trades
+    bid, ask = _quote_arrays(market_data)
+    return _mark_to_market(capital_path, inventory_path, bid, ask, start_capital, results)
+
+
+def _backtest_quoting_vectorized(strategy, bid, ask, start_capital, results):
+    """Derive a quoting strategy's orders from (bid, ask) in vector form and settle them."""
+    active = (bid > 0) & (ask > 0)
+    if isinstance(strategy, ArbitrageStrategy):
+        offset = 1
+        active &= ask - bid >= strategy.min_spread
+    else:
+        offset = strategy.spread // 2
     
-    if len(returns) > 1:
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-        if std_return > 0:
-            results['sharpe_ratio'] = mean_return / std_return
+    tick = np.flatnonzero(active)
+    touch_sum = bid[tick] + ask[tick]
+    bid_px = touch_sum // 2 - offset
+    ask_px = (touch_sum + 1) // 2 + offset
     
-    # Calculate win rate (simplified)
-    positive_returns = sum(1 for r in returns if r > 0)
-    results['win_rate'] = positive_returns / len(returns) if returns else 0.0
+    # A side is requoted when its exact quote moves far enough from the last one
+    new_bid, strategy.last_bid = _requote_mask(touch_sum / 2 - offset, strategy.last_bid,
+                                               strategy.requote_threshold)
+    new_ask, strategy.last_ask = _requote_mask(touch_sum / 2 + offset, strategy.last_ask,
+                                               strategy.requote_threshold)
     
-    return results
+    n_bids = np.count_nonzero(new_bid)
+    order_tick = np.concatenate((tick[new_bid], tick[new_ask]))
+    sides = np.empty(len(order_tick), dtype=np.int8)
+    sides[:n_bids] = int(Side.BUY)
+    sides[n_bids:] = int(Side.SELL)
+    prices = np.concatenate((bid_px[new_bid], ask_px[new_ask]))
+    qtys = np.full(len(order_tick), strategy.quantity, dtype=np.int64)
+    return _settle_orders(strategy, order_tick, sides, prices, qtys,
+                          bid, ask, start_capital, results)
+
+
+def _requote_mask(quotes: np.ndarray, last: float, threshold: float) -> Tuple[np.ndarray, float]:
+    """
+    Which candidate quotes are sent, and the last quote sent afterwards.
+    
+    Quotes lie on the half-tick grid, so with a threshold of up to half a tick
+    every move is requoted and the gate is a shifted comparison; larger
+    thresholds depend on the last quote actually sent and are resolved
+    sequentially.
+    """
+    if len(quotes) == 0:
+        return np.zeros(0, dtype=bool), last
+    if threshold <= 0:
+        return np.ones(len(quotes), dtype=bool), float(quotes[-1])
+    if threshold <= 0.5:
+        return quotes != np.concatenate(([last], quotes[:-1])), float(quotes[-1])
+    
+    mask = np.zeros(len(quotes), dtype=bool)
+    for i, quote in enumerate(quotes.tolist()):
+        if abs(quote - last) >= threshold:
+            mask[i] = True
+            last = quote
+    return mask, last
+
+
+def _settle_orders(strategy, tick, sides, prices, qtys, bid, ask, start_capital, results):
+    """
+    Fill orders against the snapshot they were placed on and mark to market.
+    
+    `tick[k]` is the snapshot index of order k. Fills are settled after all
+    orders are known, so this is only valid for strategies whose orders do
+    not depend on their inventory. Updates the strategy's inventory and
+    `results`; returns final capital and the per-snapshot return statistics.
+    """
+    n = len(bid)
+    qtys = qtys.astype(np.int64)
+    
+    # Simulate order execution (simplified): marketable orders fill at the touch
+    buy_fill = (sides == int(Side.BUY)) & (prices >= ask[tick])
+    sell_fill = (sides == int(Side.SELL)) & (prices <= bid[tick])
+    
+    cash_flow = np.where(sell_fill, bid[tick] * qtys, 0) - np.where(buy_fill, ask[tick] * qtys, 0)
+    position_change = np.where(buy_fill, qtys, 0) - np.where(sell_fill, qtys, 0)
+    capital = start_capital + np.cumsum(np.bincount(tick, weights=cash_flow, minlength=n))
+    inventory = strategy.inventory + np.cumsum(
+        np.bincount(tick, weights=position_change, minlength=n)).astype(np.int64)
+    
+    results['total_trades'] = int(np.count_nonzero(buy_fill | sell_fill))
+    if n:
+        strategy.inventory = int(inventory[-1])
+    return _mark_to_market(capital, inventory, bid, ask, start_capital, results)
+
+
+def _mark_to_market(capital, inventory, bid, ask, start_capital, results):
+    """
+    Drawdown and return statistics from per-snapshot capital and inventory.
+    
+    Sets results['max_drawdown']; returns final capital and the return statistics.
+    """
+    # Track performance; peak[i] is the running max before snapshot i
+    total_value = capital + inventory * (bid + ask) / 2
+    peak = np.maximum.accumulate(np.concatenate(([start_capital], total_value)))
+    returns = (total_value - peak[:-1]) / peak[:-1]
+    
+    if len(capital):
+        results['max_drawdown'] = max(0.0, float(((peak[1:] - total_value) / peak[1:]).max()))
+        return float(capital[-1]), _return_stats(returns)
+    return start_capital, _return_stats(returns)
+
+
+# ---------------------------------------------------------------------------
+# Compiled backtest kernels for the built-in strategies (see _kernels.py).
+# ---------------------------------------------------------------------------
+
+def _quote_arrays(market_data: List[MarketSnapshot]) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract best bid/ask arrays from snapshots in a single pass."""
+    quotes = np.fromiter(((s.best_bid, s.best_ask) for s in market_data),
+                         dtype=[('best_bid', 'i8'), ('best_ask', 'i8')],
+                         count=len(market_data))
+    return np.ascontiguousarray(quotes['best_bid']), np.ascontiguousarray(quotes['best_ask'])
+
+
+def _backtest_quoting(strategy, market_data, start_capital, results):
+    """Run a quoting strategy through the compiled kernel and write back its state."""
+    if isinstance(strategy, ArbitrageStrategy):
+        offset, min_spread = 1, strategy.min_spread
+    else:
+        offset, min_spread = strategy.spread // 2, np.iinfo(np.int64).min
+    
+    bid, ask = _quote_arrays(market_data)
+    (capital, strategy.inventory, total_trades, max_drawdown, mean_return, std_return, wins,
+     strategy.last_bid, strategy.last_ask) = _quoting_kernel(
+        bid, ask, offset, min_spread, float(strategy.requote_threshold),
+        strategy.quantity, float(start_capital),
+        strategy.inventory, float(strategy.last_bid), float(strategy.last_ask))
+    
+    results['total_trades'] = total_trades
+    results['max_drawdown'] = max_drawdown
+    return capital, (len(bid), mean_return, std_return, wins)
+
+
+def _backtest_signal(strategy, market_data, start_capital, results):
+    """Run a rolling-mean signal strategy through the compiled kernel and write back its state."""
+    if isinstance(strategy, MomentumStrategy):
+        momentum, min_history, threshold = True, 20, strategy.momentum_threshold
+    else:
+        momentum, min_history, threshold = False, 10, strategy.threshold
+    
+    bid, ask = _quote_arrays(market_data)
+    (capital, strategy.inventory, total_trades, max_drawdown, mean_return, std_return, wins,
+     strategy._head, strategy._count, strategy._sum, strategy._sum_recent,
+     strategy._sum_older, strategy.last_action) = _signal_kernel(
+        bid, ask, strategy._buf, strategy._head, strategy._count, strategy._sum,
+        strategy._sum_recent, strategy._sum_older, min_history, momentum,
+        float(threshold), strategy.quantity, float(start_capital),
+        strategy.inventory, strategy.last_action)
+    
+    results['total_trades'] = total_trades
+    results['max_drawdown'] = max_drawdown
+    return capital, (len(bid), mean_return, std_return, wins)
+
+
+# Strategies whose quotes are a fixed function of (bid, ask)
+_QUOTING_STRATEGIES = (SimpleStrategy, ArbitrageStrategy)
+
+# Strategy types with a dedicated compiled kernel (exact type match; subclasses may
+# override update() and must use the generic loop)
+_BACKTEST_KERNELS = {
+    SimpleStrategy: _backtest_quoting,
+    ArbitrageStrategy: _backtest_quoting,
+    MeanReversionStrategy: _backtest_signal,
+    MomentumStrategy: _backtest_signal,
+}
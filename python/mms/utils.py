@@ -4,11 +4,35 @@ Utility functions for market microstructure analysis and visualization.
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import Dict, List, Any, Optional, Tuple
 import os
-from .core import create_dataframes, calculate_statistics
+import time
+from .core import create_dataframes, calculate_statistics, _agent_segments, _dataframes
+from .core import TRADE_DTYPE, SNAPSHOT_DTYPE, PNL_DTYPE
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Table names written by save_results, and the file extension of each format
+RESULT_TABLES = ('trades', 'market_snapshots', 'agent_pnl')
+_RESULT_DTYPES = {'trades': TRADE_DTYPE, 'market_snapshots': SNAPSHOT_DTYPE, 'agent_pnl': PNL_DTYPE}
+_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet'}
+
+
+def _plotting_modules():
+    """
+    Import matplotlib and seaborn on first use.
+    
+    Importing mms.utils does not pay for them unless something is plotted;
+    seaborn is only used for the colour palette.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
 
 
 def plot_results(result_dict: Dict[str, np.ndarray], 
@@ -21,11 +45,18 @@ def plot_results(result_dict: Dict[str, np.ndarray],
         result_dict: Results from simulator.run()
         output_dir: Directory to save plots
         figsize: Figure size tuple
+    
+    Does nothing (and does not import matplotlib) when the trades, snapshots
+    and agent PnL are all empty.
     """
+    if all(len(result_dict[name]) == 0 for name in RESULT_TABLES):
+        return
+    
+    plt, sns = _plotting_modules()
     os.makedirs(output_dir, exist_ok=True)
     
-    # Convert to DataFrames
-    dfs = create_dataframes(result_dict)
+    # Convert to DataFrames (cached on Results from Simulator.run)
+    dfs = _dataframes(result_dict)
     
     # Set up the plotting style
     plt.style.use('seaborn-v0_8')
@@ -34,18 +65,25 @@ def plot_results(result_dict: Dict[str, np.ndarray],
     # Create subplots
     fig, axes = plt.subplots(2, 3, figsize=figsize)
     fig.suptitle('Market Microstructure Simulation Results', fontsize=16, fontweight='bold')
+    # Both rows of the first two columns are plotted against the timestamp
+    axes[1, 0].sharex(axes[0, 0])
+    axes[1, 1].sharex(axes[0, 1])
+    
+    # Snapshot columns as plain arrays; derived series are computed once
+    if not dfs['market_snapshots'].empty:
+        snapshots = dfs['market_snapshots']
+        ts = snapshots['timestamp'].to_numpy()
+        bb = snapshots['best_bid'].to_numpy()
+        ba = snapshots['best_ask'].to_numpy()
+        mid = (bb + ba) * 0.5
+        spread = ba - bb
     
     # 1. Price evolution
     if not dfs['market_snapshots'].empty:
         ax1 = axes[0, 0]
-        snapshots = dfs['market_snapshots']
-        snapshots['mid_price'] = (snapshots['best_bid'] + snapshots['best_ask']) / 2
         
-        ax1.plot(snapshots['timestamp'], snapshots['mid_price'], 'b-', linewidth=1, alpha=0.7)
-        ax1.fill_between(snapshots['timestamp'], 
-                        snapshots['best_bid'], 
-                        snapshots['best_ask'], 
-                        alpha=0.3, color='gray', label='Bid-Ask Spread')
+        ax1.plot(ts, mid, 'b-', linewidth=1, alpha=0.7)
+        ax1.fill_between(ts, bb, ba, alpha=0.3, color='gray', label='Bid-Ask Spread')
         ax1.set_title('Price Evolution')
         ax1.set_xlabel('Timestamp')
         ax1.set_ylabel('Price')
@@ -55,8 +93,7 @@ def plot_results(result_dict: Dict[str, np.ndarray],
     # 2. Bid-Ask Spread
     if not dfs['market_snapshots'].empty:
         ax2 = axes[0, 1]
-        snapshots['spread'] = snapshots['best_ask'] - snapshots['best_bid']
-        ax2.plot(snapshots['timestamp'], snapshots['spread'], 'r-', linewidth=1)
+        ax2.plot(ts, spread, 'r-', linewidth=1)
         ax2.set_title('Bid-Ask Spread')
         ax2.set_xlabel('Timestamp')
         ax2.set_ylabel('Spread')
@@ -66,45 +103,40 @@ def plot_results(result_dict: Dict[str, np.ndarray],
     if not dfs['trades'].empty:
         ax3 = axes[0, 2]
         trades = dfs['trades']
-        # Aggregate volume by time buckets
-        trades['time_bucket'] = trades['timestamp'] // 1000000  # 1ms buckets
-        volume_by_time = trades.groupby('time_bucket')['quantity'].sum()
+        # Aggregate volume by time buckets (dense integer keys: bincount, no hashing)
+        buckets = trades['timestamp'].to_numpy() // 1000000  # 1ms buckets
+        first_bucket = buckets.min()
+        volume = np.bincount(buckets - first_bucket, weights=trades['quantity'].to_numpy())
+        traded = np.flatnonzero(volume)
         
-        ax3.bar(volume_by_time.index, volume_by_time.values, alpha=0.7, color='green')
+        ax3.bar(traded + first_bucket, volume[traded], alpha=0.7, color='green')
         ax3.set_title('Trading Volume Over Time')
         ax3.set_xlabel('Time Bucket')
         ax3.set_ylabel('Volume')
         ax3.grid(True, alpha=0.3)
     
-    # 4. Agent PnL
+    # 4./5. Agent PnL and inventory, one LineCollection per axis rather than
+    # a Line2D per agent; agents keep their order of first appearance
     if not dfs['agent_pnl'].empty:
-        ax4 = axes[1, 0]
         pnl_data = dfs['agent_pnl']
+        agent_ts = pnl_data['timestamp'].to_numpy()
+        order, starts, ends = _agent_segments(pnl_data['agent_id'].to_numpy())
+        by_appearance = np.argsort(order[starts], kind='stable')
+        starts, ends = starts[by_appearance], ends[by_appearance]
+        agent_ids = pnl_data['agent_id'].to_numpy()[order[starts]]
         
-        for agent_id in pnl_data['agent_id'].unique():
-            agent_data = pnl_data[pnl_data['agent_id'] == agent_id]
-            ax4.plot(agent_data['timestamp'], agent_data['pnl'], 
-                    label=f'Agent {agent_id}', linewidth=2)
-        
+        ax4 = axes[1, 0]
+        _plot_agent_lines(ax4, agent_ts, pnl_data['pnl'].to_numpy(), order, starts, ends, agent_ids)
         ax4.set_title('Agent PnL Over Time')
         ax4.set_xlabel('Timestamp')
         ax4.set_ylabel('PnL')
-        ax4.legend()
         ax4.grid(True, alpha=0.3)
-    
-    # 5. Agent Inventory
-    if not dfs['agent_pnl'].empty:
-        ax5 = axes[1, 1]
-        
-        for agent_id in pnl_data['agent_id'].unique():
-            agent_data = pnl_data[pnl_data['agent_id'] == agent_id]
-            ax5.plot(agent_data['timestamp'], agent_data['inventory'], 
-                    label=f'Agent {agent_id}', linewidth=2)
         
+        ax5 = axes[1, 1]
+        _plot_agent_lines(ax5, agent_ts, pnl_data['inventory'].to_numpy(), order, starts, ends, agent_ids)
         ax5.set_title('Agent Inventory Over Time')
         ax5.set_xlabel('Timestamp')
         ax5.set_ylabel('Inventory')
-        ax5.legend()
         ax5.grid(True, alpha=0.3)
     
     # 6. Trade Size Distribution
@@ -112,7 +144,7 @@ def plot_results(result_dict: Dict[str, np.ndarray],
         ax6 = axes[1, 2]
         trades = dfs['trades']
         
-        ax6.hist(trades['quantity'], bins=50, alpha=0.7, color='purple', edgecolor='black')
+        _histogram_bars(ax6, trades['quantity'].to_numpy(), alpha=0.7, color='purple', edgecolor='black')
         ax6.set_title('Trade Size Distribution')
         ax6.set_xlabel('Trade Size')
         ax6.set_ylabel('Frequency')
@@ -126,34 +158,77 @@ def plot_results(result_dict: Dict[str, np.ndarray],
     _create_detailed_plots(dfs, output_dir)
 
 
+def _plot_agent_lines(ax, timestamps: np.ndarray, values: np.ndarray,
+                      order: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                      agent_ids: np.ndarray) -> None:
+    """Draw one polyline per agent segment as a single LineCollection."""
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+    
+    cycle = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    colors = [cycle[i % len(cycle)] for i in range(len(starts))]
+    segments = [np.column_stack((timestamps[order[lo:hi]], values[order[lo:hi]]))
+                for lo, hi in zip(starts, ends)]
+    
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=2))
+    ax.autoscale_view()
+    # The collection is a single artist, so the legend uses proxy handles
+    handles = [Line2D([], [], color=color, linewidth=2) for color in colors]
+    ax.legend(handles, [f'Agent {agent_id}' for agent_id in agent_ids])
+
+
+def _histogram_bars(ax, values: np.ndarray, bins: int = 50, **bar_kwargs) -> None:
+    """
+    Draw a histogram with ax.bar from counts computed in one pass.
+    
+    Integer columns are binned exactly by mapping each value linearly onto
+    its bin index and counting with np.bincount; float (or constant) columns
+    go through np.histogram. The bars match what ax.hist would draw.
+    """
+    values = np.asarray(values)
+    lo, hi = values.min(), values.max()
+    if values.dtype.kind in 'iu' and hi > lo:
+        idx = (values.astype(np.int64) - int(lo)) * bins // (int(hi) - int(lo))
+        # The maximum lands on index `bins`; like np.histogram, the last bin is closed
+        counts = np.bincount(np.minimum(idx, bins - 1), minlength=bins)
+        edges = np.linspace(lo, hi, bins + 1)
+    else:
+        counts, edges = np.histogram(values, bins=bins)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', **bar_kwargs)
+
+
 def _create_detailed_plots(dfs: Dict[str, pd.DataFrame], output_dir: str) -> None:
     """Create additional detailed analysis plots."""
+    import matplotlib.pyplot as plt
     
     # Price impact analysis
     if not dfs['trades'].empty and not dfs['market_snapshots'].empty:
         fig, axes = plt.subplots(1, 2, figsize=(15, 6))
         
         trades = dfs['trades']
-        snapshots = dfs['market_snapshots']
+        ts = trades['timestamp'].to_numpy()
+        px = trades['price'].to_numpy()
+        qty = trades['quantity'].to_numpy()
         
         # Trade price vs time
-        axes[0].scatter(trades['timestamp'], trades['price'], alpha=0.6, s=10)
+        axes[0].scatter(ts, px, alpha=0.6, s=10)
         axes[0].set_title('Trade Prices Over Time')
         axes[0].set_xlabel('Timestamp')
         axes[0].set_ylabel('Trade Price')
         axes[0].grid(True, alpha=0.3)
         
         # Volume-weighted average price (VWAP)
-        vwap = (trades['price'] * trades['quantity']).sum() / trades['quantity'].sum()
+        vwap = np.dot(px, qty) / qty.sum()
         axes[1].axhline(y=vwap, color='r', linestyle='--', label=f'VWAP: {vwap:.2f}')
         
-        # Plot VWAP over time
-        trades_sorted = trades.sort_values('timestamp')
-        cumulative_volume = trades_sorted['quantity'].cumsum()
-        cumulative_value = (trades_sorted['price'] * trades_sorted['quantity']).cumsum()
-        rolling_vwap = cumulative_value / cumulative_volume
+        # Plot VWAP over time (trades are normally already in time order)
+        if not np.all(ts[:-1] <= ts[1:]):
+            order = np.argsort(ts, kind='stable')
+            ts, px, qty = ts[order], px[order], qty[order]
+        rolling_vwap = np.cumsum(px * qty) / np.cumsum(qty)
         
-        axes[1].plot(trades_sorted['timestamp'], rolling_vwap, 'b-', alpha=0.7, label='Rolling VWAP')
+        axes[1].plot(ts, rolling_vwap, 'b-', alpha=0.7, label='Rolling VWAP')
         axes[1].set_title('Volume-Weighted Average Price')
         axes[1].set_xlabel('Timestamp')
         axes[1].set_ylabel('Price')
@@ -170,33 +245,34 @@ def _create_detailed_plots(dfs: Dict[str, pd.DataFrame], output_dir: str) -> Non
         
         pnl_data = dfs['agent_pnl']
         
+        # Last record per agent, from the segment ends of one stable sort
+        order, starts, ends = _agent_segments(pnl_data['agent_id'].to_numpy())
+        agent_ids = pnl_data['agent_id'].to_numpy()[order[starts]]
+        last = order[ends - 1]
+        
         # Final PnL comparison
-        final_pnl = pnl_data.groupby('agent_id')['pnl'].last()
-        axes[0, 0].bar(final_pnl.index, final_pnl.values)
+        axes[0, 0].bar(agent_ids, pnl_data['pnl'].to_numpy()[last])
         axes[0, 0].set_title('Final PnL by Agent')
         axes[0, 0].set_xlabel('Agent ID')
         axes[0, 0].set_ylabel('Final PnL')
         axes[0, 0].grid(True, alpha=0.3)
         
         # Final inventory comparison
-        final_inventory = pnl_data.groupby('agent_id')['inventory'].last()
-        axes[0, 1].bar(final_inventory.index, final_inventory.values, color='orange')
+        axes[0, 1].bar(agent_ids, pnl_data['inventory'].to_numpy()[last], color='orange')
         axes[0, 1].set_title('Final Inventory by Agent')
         axes[0, 1].set_xlabel('Agent ID')
         axes[0, 1].set_ylabel('Final Inventory')
         axes[0, 1].grid(True, alpha=0.3)
         
         # PnL distribution
-        all_pnl = pnl_data['pnl'].values
-        axes[1, 0].hist(all_pnl, bins=50, alpha=0.7, color='green', edgecolor='black')
+        _histogram_bars(axes[1, 0], pnl_data['pnl'].to_numpy(), alpha=0.7, color='green', edgecolor='black')
         axes[1, 0].set_title('PnL Distribution')
         axes[1, 0].set_xlabel('PnL')
         axes[1, 0].set_ylabel('Frequency')
         axes[1, 0].grid(True, alpha=0.3)
         
         # Inventory distribution
-        all_inventory = pnl_data['inventory'].values
-        axes[1, 1].hist(all_inventory, bins=50, alpha=0.7, color='red', edgecolor='black')
+        _histogram_bars(axes[1, 1], pnl_data['inventory'].to_numpy(), alpha=0.7, color='red', edgecolor='black')
         axes[1, 1].set_title('Inventory Distribution')
         axes[1, 1].set_xlabel('Inventory')
         axes[1, 1].set_ylabel('Frequency')
@@ -208,44 +284,47 @@ def _create_detailed_plots(dfs: Dict[str, pd.DataFrame], output_dir: str) -> Non
 
 
 def save_results(result_dict: Dict[str, np.ndarray], 
-                output_dir: str = "results") -> Dict[str, str]:
+                output_dir: str = "results",
+                format: str = "csv",
+                binary: bool = True) -> Dict[str, str]:
     """
-    Save simulation results to CSV files.
+    Save simulation results to CSV or Parquet files.
     
     Args:
         result_dict: Results from simulator.run()
         output_dir: Directory to save results
+        format: 'csv', or 'parquet' (zstd-compressed, requires pyarrow)
+        binary: Also write each table as a raw .npy structured array, which
+            load_results memory-maps instead of parsing the CSV/Parquet file
         
     Returns:
-        Dictionary mapping data types to file paths
+        Dictionary mapping data types to file paths (the .npy copies under
+        '<name>_npy')
     """
-    os.makedirs(output_dir, exist_ok=True)
+    if format not in _EXTENSIONS:
+        raise ValueError(f"Unknown format {format!r}; expected one of {sorted(_EXTENSIONS)}")
+    if format == 'parquet' and pa is None:
+        raise ImportError("Parquet output requires pyarrow; install the 'io' extra "
+                          "(pip install market-microstructure-simulator[io])")
+    write = _write_parquet if format == 'parquet' else _write_csv
     
-    # Convert to DataFrames
-    dfs = create_dataframes(result_dict)
+    os.makedirs(output_dir, exist_ok=True)
     
     file_paths = {}
     
-    # Save trades
-    if not dfs['trades'].empty:
-        trades_file = os.path.join(output_dir, 'trades.csv')
-        dfs['trades'].to_csv(trades_file, index=False)
-        file_paths['trades'] = trades_file
-    
-    # Save market snapshots
-    if not dfs['market_snapshots'].empty:
-        snapshots_file = os.path.join(output_dir, 'market_snapshots.csv')
-        dfs['market_snapshots'].to_csv(snapshots_file, index=False)
-        file_paths['market_snapshots'] = snapshots_file
-    
-    # Save agent PnL
-    if not dfs['agent_pnl'].empty:
-        pnl_file = os.path.join(output_dir, 'agent_pnl.csv')
-        dfs['agent_pnl'].to_csv(pnl_file, index=False)
-        file_paths['agent_pnl'] = pnl_file
+    # Save trades, market snapshots and agent PnL
+    for name in RESULT_TABLES:
+        if len(result_dict[name]) > 0:
+            path = os.path.join(output_dir, name + _EXTENSIONS[format])
+            write(result_dict[name], path)
+            file_paths[name] = path
+            if binary:
+                npy_path = os.path.join(output_dir, name + '.npy')
+                _save_npy(result_dict[name], npy_path)
+                file_paths[name + '_npy'] = npy_path
     
     # Save summary statistics
-    stats = calculate_statistics(dfs)
+    stats = calculate_statistics(result_dict)
     stats_file = os.path.join(output_dir, 'summary_statistics.txt')
     with open(stats_file, 'w') as f:
         f.write("Market Microstructure Simulation Summary\n")
@@ -265,6 +344,120 @@ def save_results(result_dict: Dict[str, np.ndarray],
     return file_paths
 
 
+def _write_csv(records: np.ndarray, path: str) -> None:
+    """Write a structured array as CSV, with PyArrow's C++ writer when installed."""
+    if pa is not None:
+        pa_csv.write_csv(_arrow_table(records), path, write_options=pa_csv.WriteOptions(batch_size=65536))
+    else:
+        pd.DataFrame(records).to_csv(path, index=False)
+
+
+def _arrow_table(records: np.ndarray):
+    """PyArrow table with one contiguous column per field of a structured array."""
+    return pa.table({name: np.ascontiguousarray(records[name]) for name in records.dtype.names})
+
+
+def _write_parquet(records: np.ndarray, path: str) -> None:
+    """Write a structured array as a zstd-compressed Parquet file."""
+    pq.write_table(_arrow_table(records), path, compression='zstd')
+
+
+def _memory_order(dtype: np.dtype) -> np.dtype:
+    """The same record layout with its fields listed in offset order."""
+    names = sorted(dtype.names, key=lambda name: dtype.fields[name][1])
+    return np.dtype({'names': names,
+                     'formats': [dtype.fields[name][0] for name in names],
+                     'offsets': [dtype.fields[name][1] for name in names],
+                     'itemsize': dtype.itemsize})
+
+
+def _save_npy(records: np.ndarray, path: str) -> None:
+    """
+    Write a structured array as .npy without repacking it.
+    
+    The result dtypes mirror the C++ structs, whose fields are not in
+    declaration order (e.g. the trade timestamp is stored last), which the
+    .npy header cannot describe; the bytes are saved through a view that
+    lists the same fields in memory order.
+    """
+    records = np.asarray(records)
+    np.save(path, records.view(_memory_order(records.dtype)), allow_pickle=False)
+
+
+def _load_npy(path: str, dtype: np.dtype) -> np.ndarray:
+    """Memory-map a .npy table, restoring the result dtype's field order."""
+    records = np.load(path, mmap_mode='r', allow_pickle=False)
+    if records.dtype != dtype and records.dtype == _memory_order(dtype):
+        records = records.view(dtype)
+    return records
+
+
+def _from_columns(columns, dtype: np.dtype) -> np.ndarray:
+    """
+    Fill a structured array of the result dtype from a table's columns.
+    
+    Works for PyArrow tables and DataFrames alike; each field is copied once,
+    straight into the C++ record layout, with no recarray or inferred dtypes.
+    """
+    records = np.empty(len(columns), dtype=dtype)
+    for name in dtype.names:
+        records[name] = np.asarray(columns[name])
+    return records
+
+
+def load_results(input_dir: str) -> Dict[str, np.ndarray]:
+    """
+    Load the tables written by save_results back into structured arrays.
+    
+    Each table is memory-mapped from its .npy file if present (read-only,
+    pages are loaded lazily), else read from its .parquet file, else from its
+    .csv file; PyArrow is used when installed, pandas otherwise (CSV only).
+    save_results skips empty tables, so a table with no file loads as an
+    empty array.
+    
+    Args:
+        input_dir: Directory passed to save_results
+        
+    Returns:
+        Dictionary with 'trades', 'market_snapshots' and 'agent_pnl' arrays
+        
+    Raises:
+        FileNotFoundError: If the directory holds none of the tables
+    """
+    result = {}
+    missing = []
+    # One directory listing instead of a stat() per candidate file
+    present = set(os.listdir(input_dir))
+    for name in RESULT_TABLES:
+        base = os.path.join(input_dir, name)
+        if name + '.npy' in present:
+            result[name] = _load_npy(base + '.npy', _RESULT_DTYPES[name])
+            continue
+        if name + '.parquet' in present:
+            if pa is None:
+                raise ImportError("Reading Parquet results requires pyarrow")
+            columns = pq.read_table(base + '.parquet')
+        elif name + '.csv' in present:
+            # Parse with the schema's types instead of inferring them (inference
+            # turns ids above 2**63 into lossy floats)
+            types = {field: dtype for field, (dtype, _) in _RESULT_DTYPES[name].fields.items()}
+            if pa is None:
+                columns = pd.read_csv(base + '.csv', dtype=types)
+            else:
+                options = pa_csv.ConvertOptions(column_types={
+                    field: pa.from_numpy_dtype(dtype) for field, dtype in types.items()})
+                columns = pa_csv.read_csv(base + '.csv', convert_options=options)
+        else:
+            missing.append(name)
+            result[name] = np.empty(0, dtype=_RESULT_DTYPES[name])
+            continue
+        result[name] = _from_columns(columns, _RESULT_DTYPES[name])
+    
+    if len(missing) == len(RESULT_TABLES):
+        raise FileNotFoundError(f"No result files in {input_dir}")
+    return result
+
+
 def create_sample_agents() -> Dict[str, Any]:
     """Create sample agent configurations for testing."""
     return {
@@ -311,21 +504,24 @@ def benchmark_simulation(n_steps: int = 100000,
     
     times = []
     
-    for i in range(iterations):
-        config = SimulationConfig(seed=seed + i)
+    # Independent, reproducible seeds per iteration
+    for config in SimulationConfig(seed=seed).spawn(iterations):
         sim = Simulator(config)
         
         maker_config = MarketMakerConfig()
         taker_config = TakerConfig()
         noise_config = NoiseTraderConfig()
         
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         result = sim.run(n_steps, maker_config, taker_config, noise_config)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         times.append(end_time - start_time)
+        
+        # Only the timing matters; never convert to DataFrames here, and free
+        # the result arrays before the next iteration
+        del result
     
     return {
         'mean_time': np.mean(times),
@@ -337,6 +533,28 @@ def benchmark_simulation(n_steps: int = 100000,
     }
 
 
+def _mean_std(values: np.ndarray) -> Tuple[float, float]:
+    """Mean and sample standard deviation (ddof=1), accumulated in float64 so large values cannot overflow."""
+    if len(values) < 2:
+        return values.mean(), np.nan
+    return values.mean(), values.std(ddof=1)
+
+
+def _percentiles(values: np.ndarray, quantiles: List[float]) -> List[float]:
+    """
+    Linearly interpolated quantiles (pandas/numpy default) from one partial sort.
+    
+    All order statistics needed for interpolation are selected in a single
+    ``np.partition`` call instead of fully sorting once per quantile.
+    """
+    positions = np.asarray(quantiles) * (len(values) - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(values) - 1)
+    part = np.partition(values, np.union1d(lower, upper))
+    lo, hi = part[lower].astype(np.float64), part[upper].astype(np.float64)
+    return list(lo + (positions - lower) * (hi - lo))
+
+
 def analyze_liquidity(result_dict: Dict[str, np.ndarray]) -> Dict[str, Any]:
     """
     Analyze market liquidity metrics.
@@ -347,35 +565,49 @@ def analyze_liquidity(result_dict: Dict[str, np.ndarray]) -> Dict[str, Any]:
     Returns:
         Liquidity analysis metrics
     """
-    dfs = create_dataframes(result_dict)
-    
-    if dfs['market_snapshots'].empty:
+    snapshots = result_dict.get('market_snapshots')
+    if snapshots is None or len(snapshots) == 0:
         return {}
     
-    snapshots = dfs['market_snapshots']
+    best_bid = snapshots['best_bid']
+    best_ask = snapshots['best_ask']
+    n = len(snapshots)
     
     # Calculate mid prices and spreads
-    snapshots['mid_price'] = (snapshots['best_bid'] + snapshots['best_ask']) / 2
-    snapshots['spread'] = snapshots['best_ask'] - snapshots['best_bid']
-    snapshots['relative_spread'] = snapshots['spread'] / snapshots['mid_price']
+    spread = np.empty(n, dtype=np.int64)
+    np.subtract(best_ask, best_bid, out=spread)
+    mid_price = np.empty(n, dtype=np.float64)
+    np.add(best_bid, best_ask, out=mid_price)
+    mid_price *= 0.5
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative_spread = np.divide(spread, mid_price, out=mid_price)
     
     # Calculate depth (total quantity at best bid/ask)
-    snapshots['depth'] = snapshots['best_bid_qty'] + snapshots['best_ask_qty']
+    depth = np.empty(n, dtype=np.int64)
+    np.add(snapshots['best_bid_qty'], snapshots['best_ask_qty'], out=depth)
+    
+    # Empty books (mid price 0) give 0/0 = NaN; skip them as pandas' mean does
+    valid = ~np.isnan(relative_spread)
+    avg_relative_spread = relative_spread[valid].mean() if valid.any() else np.nan
+    
+    avg_spread, spread_volatility = _mean_std(spread)
+    avg_depth, depth_volatility = _mean_std(depth)
+    p25, p50, p75, p95 = _percentiles(spread, [0.25, 0.50, 0.75, 0.95])
     
     # Liquidity metrics
     liquidity_metrics = {
-        'avg_spread': snapshots['spread'].mean(),
-        'avg_relative_spread': snapshots['relative_spread'].mean(),
-        'spread_volatility': snapshots['spread'].std(),
-        'avg_depth': snapshots['depth'].mean(),
-        'depth_volatility': snapshots['depth'].std(),
-        'min_spread': snapshots['spread'].min(),
-        'max_spread': snapshots['spread'].max(),
+        'avg_spread': avg_spread,
+        'avg_relative_spread': avg_relative_spread,
+        'spread_volatility': spread_volatility,
+        'avg_depth': avg_depth,
+        'depth_volatility': depth_volatility,
+        'min_spread': spread.min(),
+        'max_spread': spread.max(),
         'spread_percentiles': {
-            '25th': snapshots['spread'].quantile(0.25),
-            '50th': snapshots['spread'].quantile(0.50),
-            '75th': snapshots['spread'].quantile(0.75),
-            '95th': snapshots['spread'].quantile(0.95)
+            '25th': p25,
+            '50th': p50,
+            '75th': p75,
+            '95th': p95
         }
     }
     
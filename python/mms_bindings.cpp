@@ -10,9 +10,31 @@
 
 namespace py = pybind11;
 
+// Flat agent PnL record laid out like the Python PNL_DTYPE
+// (std::tuple has no guaranteed memory layout, so it cannot be viewed directly)
+struct AgentPnlRecord {
+    mms::Timestamp timestamp;
+    mms::OrderId agent_id;
+    double pnl;
+    mms::Qty inventory;
+};
+
+// Wrap a vector of POD records as a numpy array without copying.
+// `owner` is the Python object holding the vector and is kept alive by the array.
+template <typename T>
+py::array_t<T> as_array_view(const std::vector<T>& records, py::handle owner) {
+    return py::array_t<T>({records.size()}, {sizeof(T)}, records.data(), owner);
+}
+
 PYBIND11_MODULE(mms_core, m) {
     m.doc() = "Market Microstructure Simulator - C++ Core";
     
+    // Numpy record layouts for zero-copy result views
+    PYBIND11_NUMPY_DTYPE(mms::Trade, maker_id, taker_id, price, quantity, timestamp);
+    PYBIND11_NUMPY_DTYPE(mms::MarketSnapshot, best_bid, best_ask, best_bid_qty, best_ask_qty,
+                         last_trade_price, timestamp);
+    PYBIND11_NUMPY_DTYPE(AgentPnlRecord, timestamp, agent_id, pnl, inventory);
+    
     // Enums
     py::enum_<mms::Side>(m, "Side")
         .value("BUY", mms::Side::BUY)
@@ -65,6 +87,10 @@ PYBIND11_MODULE(mms_core, m) {
         .def_readwrite("best_ask_qty", &mms::MarketSnapshot::best_ask_qty)
         .def_readwrite("last_trade_price", &mms::MarketSnapshot::last_trade_price)
         .def_readwrite("timestamp", &mms::MarketSnapshot::timestamp)
+        // Exact (unrounded) mid, computed once here instead of in each Python strategy
+        .def_property_readonly("mid_price", [](const mms::MarketSnapshot& s) {
+            return (s.best_bid + s.best_ask) / 2.0;
+        })
         .def("__repr__", [](const mms::MarketSnapshot& s) {
             return "MarketSnapshot(bid=" + std::to_string(s.best_bid) +
                    ", ask=" + std::to_string(s.best_ask) +
@@ -160,7 +186,25 @@ PYBIND11_MODULE(mms_core, m) {
         .def_readonly("total_events_processed", &mms::Simulator::RunResult::total_events_processed)
         .def_readonly("total_trades", &mms::Simulator::RunResult::total_trades)
         .def_readonly("simulation_duration", &mms::Simulator::RunResult::simulation_duration)
-        .def_readonly("simulation_time_seconds", &mms::Simulator::RunResult::simulation_time_seconds);
+        .def_readonly("simulation_time_seconds", &mms::Simulator::RunResult::simulation_time_seconds)
+        // Structured numpy views over the result buffers (no per-record Python objects)
+        .def_property_readonly("trades_view", [](py::object self) {
+            const auto& result = self.cast<const mms::Simulator::RunResult&>();
+            return as_array_view(result.trades, self);
+        })
+        .def_property_readonly("market_snapshots_view", [](py::object self) {
+            const auto& result = self.cast<const mms::Simulator::RunResult&>();
+            return as_array_view(result.market_snapshots, self);
+        })
+        .def_property_readonly("agent_pnl_view", [](const mms::Simulator::RunResult& result) {
+            // Repack tuples into flat records in a single C++ pass
+            py::array_t<AgentPnlRecord> records(result.agent_pnl.size());
+            auto* out = records.mutable_data();
+            for (const auto& [agent_id, timestamp, pnl, inventory] : result.agent_pnl) {
+                *out++ = AgentPnlRecord{timestamp, agent_id, pnl, inventory};
+            }
+            return records;
+        });
     
     // Simulator
     py::class_<mms::Simulator>(m, "Simulator")
@@ -176,7 +220,7 @@ PYBIND11_MODULE(mms_core, m) {
     // RNG
     py::class_<mms::RNG>(m, "RNG")
         .def(py::init<>())
-        .def(py::init<uint64_t>())
+        .def(py::init<uint64_t, uint64_t>(), py::arg("seed"), py::arg("stream") = 0)
         .def("uniform_int", [](mms::RNG& self, int min, int max) {
             return self.uniform_int(min, max);
         })
@@ -186,7 +230,9 @@ PYBIND11_MODULE(mms_core, m) {
         .def("normal", &mms::RNG::normal)
         .def("poisson", &mms::RNG::poisson)
         .def("bernoulli", &mms::RNG::bernoulli)
-        .def("seed", &mms::RNG::seed);
+        .def("seed", &mms::RNG::seed, py::arg("seed"), py::arg("stream") = 0)
+        .def("get_seed", &mms::RNG::get_seed)
+        .def("jumped", &mms::RNG::jumped, py::arg("jumps") = 1);
     
     // Utility functions
     m.def("side_to_string", &mms::side_to_string);
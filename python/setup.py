@@ -4,6 +4,7 @@ Setup script for Market Microstructure Simulator Python package.
 
 from setuptools import setup, find_packages, Extension
 from pybind11.setup_helpers import Pybind11Extension, build_ext
+import importlib.util
 import os
 import sys
 
@@ -25,6 +26,45 @@ ext_modules = [
     )
 ]
 
+
+def aot_extensions():
+    """
+    Numba AOT-compiled strategy kernels (mms.mms_kernels).
+    
+    Opt-in: built only when MMS_BUILD_AOT=1 is set and Numba is installed.
+    numba.pycc is pending deprecation, so a plain install never depends on
+    it; without the extension the kernels are JIT-compiled on first use.
+    """
+    if os.environ.get("MMS_BUILD_AOT", "0").strip() in ("", "0"):
+        return []
+    try:
+        import numba.pycc  # noqa: F401
+    except ImportError:
+        return []
+    # Load by path: the mms package is not importable before mms_core is built
+    spec = importlib.util.spec_from_file_location("mms._aot_build", os.path.join("mms", "_aot_build.py"))
+    aot_build = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(aot_build)
+    return [aot_build.cc.distutils_extension()]
+
+
+class BuildExt(build_ext):
+    """
+    pybind11 build_ext that also compiles pycc extensions.
+    
+    This relies on pycc's private ``_prepare_object_files`` hook (what its own
+    build_ext patch calls), which is one reason the AOT build is opt-in.
+    """
+    
+    def build_extension(self, ext):
+        if hasattr(ext, "_prepare_object_files"):
+            # pycc's own hook only patches the plain distutils build_ext
+            ext._prepare_object_files(self)
+        super().build_extension(ext)
+
+
+ext_modules += aot_extensions()
+
 setup(
     name="market-microstructure-simulator",
     version="1.0.0",
@@ -52,7 +92,7 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
-        "numpy>=1.21.0",
+        "numpy>=1.23.0",
         "pandas>=1.3.0",
         "matplotlib>=3.5.0",
         "seaborn>=0.11.0",
@@ -78,9 +118,15 @@ setup(
             "plotly>=5.0.0",
             "bokeh>=2.4.0",
         ],
+        "jit": [
+            "numba>=0.56.0",
+        ],
+        "io": [
+            "pyarrow>=10.0.0",
+        ],
     },
     ext_modules=ext_modules,
-    cmdclass={"build_ext": build_ext},
+    cmdclass={"build_ext": BuildExt},
     entry_points={
         "console_scripts": [
             "mms-sim=scripts.run_sim:main",
@@ -15,9 +15,86 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from mms import (
     Simulator, SimulationConfig, MarketMakerConfig, TakerConfig, NoiseTraderConfig,
-    Side, EventType, Order, Trade, MarketSnapshot
+    Side, EventType, Order, Trade, MarketSnapshot, OrderBatch, Results
 )
-from mms.utils import create_dataframes, calculate_statistics, plot_results, save_results
+from mms.utils import (
+    create_dataframes, calculate_statistics, plot_results, save_results, load_results, analyze_liquidity
+)
+from mms.core import TRADE_DTYPE, SNAPSHOT_DTYPE, PNL_DTYPE
+from mms.strategies import (
+    BaseStrategy, SimpleStrategy, ArbitrageStrategy, MeanReversionStrategy, MomentumStrategy,
+    backtest_strategy, vectorized_backtest, KERNELS_AVAILABLE
+)
+
+
+# One-row mock results (read-only; the tests only convert and save them)
+_MOCK_RESULT = {
+    'trades': np.array([(1000, 1, 2, 10000, 50)],
+                       dtype=[('timestamp', 'i8'), ('maker_id', 'u8'),
+                              ('taker_id', 'u8'), ('price', 'i8'), ('quantity', 'i8')]),
+    'market_snapshots': np.array([(1000, 9999, 10001, 100, 50, 10000)],
+                                 dtype=[('timestamp', 'i8'), ('best_bid', 'i8'),
+                                        ('best_ask', 'i8'), ('best_bid_qty', 'i8'),
+                                        ('best_ask_qty', 'i8'), ('last_trade_price', 'i8')]),
+    'agent_pnl': np.array([(1000, 1, 100.5, 50)],
+                          dtype=[('timestamp', 'i8'), ('agent_id', 'u8'),
+                                 ('pnl', 'f8'), ('inventory', 'i8')])
+}
+
+
+def _first(df, column):
+    """First value of a column, read from its numpy array (no row Series)."""
+    return df[column].to_numpy()[0]
+
+
+@pytest.fixture(scope='module')
+def default_configs():
+    """Default maker, taker and noise trader configs, built once per module."""
+    return MarketMakerConfig(), TakerConfig(), NoiseTraderConfig()
+
+
+@pytest.fixture(scope='module')
+def sim_factory():
+    """Build a seeded Simulator."""
+    def make(seed=42, **kwargs):
+        return Simulator(SimulationConfig(seed=seed, **kwargs))
+    return make
+
+
+@pytest.fixture(scope='module')
+def default_run(sim_factory, default_configs):
+    """One 1000-step run with seed 42, shared by the read-only result tests."""
+    return sim_factory(42).run(1000, *default_configs)
+
+
+@pytest.fixture(scope='module')
+def seed_runs(sim_factory, default_configs):
+    """100-step runs for the seed tests: seed 11111 twice, seed 22222 once."""
+    return {
+        11111: [sim_factory(11111).run(100, *default_configs) for _ in range(2)],
+        22222: [sim_factory(22222).run(100, *default_configs)]
+    }
+
+
+@pytest.fixture(scope='module')
+def backtest_quotes(sim_factory, default_configs):
+    """
+    Best bid/ask series for the backtest equivalence tests.
+    
+    'simulated' is a real 20000-step run; its book barely moves, so
+    'random_walk' adds a seeded walk around the same prices with locked,
+    crossed and empty books that make every strategy trade.
+    """
+    snapshots = sim_factory(42).run(20000, *default_configs)['market_snapshots']
+    bid = snapshots['best_bid'].astype(np.int64)
+    ask = snapshots['best_ask'].astype(np.int64)
+    
+    rng = np.random.default_rng(7)
+    mid = int(np.median(bid[bid > 0])) + np.cumsum(rng.integers(-3, 4, 2000))
+    walk_bid = mid + rng.integers(-3, 3, 2000)
+    walk_ask = mid + rng.integers(-3, 3, 2000)
+    walk_bid[::97] = 0
+    return {'simulated': (bid, ask), 'random_walk': (walk_bid, walk_ask)}
 
 
 class TestSimulator:
@@ -34,15 +111,19 @@ class TestSimulator:
         sim = Simulator(config)
         assert sim is not None
     
-    def test_basic_simulation_run(self):
-        """Test basic simulation execution."""
-        sim = Simulator(SimulationConfig(seed=42))
-        
-        maker_config = MarketMakerConfig()
-        taker_config = TakerConfig()
-        noise_config = NoiseTraderConfig()
+    def test_spawn_configs(self):
+        """Test independent, reproducible per-run seeds from one config."""
+        config = SimulationConfig(seed=123, time_step=2000)
         
-        result = sim.run(1000, maker_config, taker_config, noise_config)
+        children = config.spawn(4)
+        seeds = [child.config.seed for child in children]
+        assert len(set(seeds)) == 4
+        assert seeds == [child.config.seed for child in config.spawn(4)]
+        assert all(child.config.time_step == 2000 for child in children)
+    
+    def test_basic_simulation_run(self, default_run):
+        """Test basic simulation execution."""
+        result = default_run
         
         assert 'trades' in result
         assert 'market_snapshots' in result
@@ -56,41 +137,39 @@ class TestSimulator:
         assert result['total_trades'][0] >= 0
         assert result['simulation_duration'][0] > 0
         assert result['simulation_time_seconds'][0] > 0.0
-    
-    def test_deterministic_simulation(self):
+
+    def test_result_array_dtypes(self, default_run):
+        """Test that result arrays use the structured result dtypes."""
+        result = default_run
+
+        assert result['trades'].dtype == TRADE_DTYPE
+        assert result['market_snapshots'].dtype == SNAPSHOT_DTYPE
+        assert result['agent_pnl'].dtype == PNL_DTYPE
+        assert len(result['market_snapshots']) > 0
+
+    @pytest.mark.parametrize('key', [
+        'trades', 'market_snapshots', 'agent_pnl',
+        'total_events_processed', 'total_trades', 'simulation_duration'
+    ])
+    def test_deterministic_simulation(self, seed_runs, key):
         """Test that simulations with same seed produce identical results."""
-        config = SimulationConfig(seed=12345)
-        sim1 = Simulator(config)
-        sim2 = Simulator(config)
-        
-        maker_config = MarketMakerConfig()
-        taker_config = TakerConfig()
-        noise_config = NoiseTraderConfig()
+        result1, result2 = seed_runs[11111]
         
-        result1 = sim1.run(100, maker_config, taker_config, noise_config)
-        result2 = sim2.run(100, maker_config, taker_config, noise_config)
-        
-        assert result1['total_events_processed'][0] == result2['total_events_processed'][0]
-        assert result1['total_trades'][0] == result2['total_trades'][0]
-        assert result1['simulation_duration'][0] == result2['simulation_duration'][0]
+        np.testing.assert_array_equal(result1[key], result2[key])
     
-    def test_different_seeds_produce_different_results(self):
+    def test_different_seeds_produce_different_results(self, seed_runs):
         """Test that different seeds produce different results."""
-        sim1 = Simulator(SimulationConfig(seed=11111))
-        sim2 = Simulator(SimulationConfig(seed=22222))
-        
-        maker_config = MarketMakerConfig()
-        taker_config = TakerConfig()
-        noise_config = NoiseTraderConfig()
+        result1 = seed_runs[11111][0]
+        result2 = seed_runs[22222][0]
         
-        result1 = sim1.run(100, maker_config, taker_config, noise_config)
-        result2 = sim2.run(100, maker_config, taker_config, noise_config)
-        
-        assert result1['total_events_processed'][0] != result2['total_events_processed'][0]
+        # A 100-step run only has a handful of events, so the count alone often
+        # coincides; the market the two runs produce must differ
+        assert (result1['total_events_processed'][0] != result2['total_events_processed'][0]
+                or not np.array_equal(result1['market_snapshots'], result2['market_snapshots']))
     
-    def test_custom_agent_configurations(self):
+    def test_custom_agent_configurations(self, sim_factory):
         """Test simulation with custom agent configurations."""
-        sim = Simulator(SimulationConfig(seed=42))
+        sim = sim_factory(42)
         
         maker_config = MarketMakerConfig(spread=5, quantity=100)
         taker_config = TakerConfig(intensity=2.0, quantity_mean=80)
@@ -101,15 +180,9 @@ class TestSimulator:
         assert result['total_events_processed'][0] > 0
         assert result['total_trades'][0] >= 0
     
-    def test_empty_simulation(self):
+    def test_empty_simulation(self, sim_factory, default_configs):
         """Test simulation with 0 steps."""
-        sim = Simulator(SimulationConfig(seed=42))
-        
-        maker_config = MarketMakerConfig()
-        taker_config = TakerConfig()
-        noise_config = NoiseTraderConfig()
-        
-        result = sim.run(0, maker_config, taker_config, noise_config)
+        result = sim_factory(42).run(0, *default_configs)
         
         assert result['total_events_processed'][0] == 0
         assert result['total_trades'][0] == 0
@@ -163,6 +236,23 @@ class TestDataTypes:
         assert snapshot.best_ask_qty == 50
         assert snapshot.last_trade_price == 10000
         assert snapshot.timestamp == 1002
+    
+    def test_order_batch(self):
+        """Test OrderBatch columns, growth and clearing."""
+        batch = OrderBatch(capacity=2)
+        for i in range(5):
+            batch.push(i, Side.SELL if i % 2 else Side.BUY, 10000 + i, 10 * i, 1000 + i)
+        
+        assert len(batch) == 5
+        np.testing.assert_array_equal(batch.ids, np.arange(5))
+        np.testing.assert_array_equal(batch.sides, [0, 1, 0, 1, 0])
+        np.testing.assert_array_equal(batch.prices, 10000 + np.arange(5))
+        np.testing.assert_array_equal(batch.qtys, 10 * np.arange(5))
+        np.testing.assert_array_equal(batch.ts, 1000 + np.arange(5))
+        
+        batch.clear()
+        assert len(batch) == 0
+        assert len(batch.prices) == 0
 
 
 class TestConfigurations:
@@ -242,19 +332,7 @@ class TestUtilities:
     
     def test_create_dataframes(self):
         """Test conversion of numpy arrays to pandas DataFrames."""
-        # Create mock result data
-        result = {
-            'trades': np.array([(1000, 1, 2, 10000, 50)], 
-                              dtype=[('timestamp', 'i8'), ('maker_id', 'u8'), 
-                                     ('taker_id', 'u8'), ('price', 'i8'), ('quantity', 'i8')]),
-            'market_snapshots': np.array([(1000, 9999, 10001, 100, 50, 10000)],
-                                       dtype=[('timestamp', 'i8'), ('best_bid', 'i8'),
-                                              ('best_ask', 'i8'), ('best_bid_qty', 'i8'),
-                                              ('best_ask_qty', 'i8'), ('last_trade_price', 'i8')]),
-            'agent_pnl': np.array([(1000, 1, 100.5, 50)],
-                                 dtype=[('timestamp', 'i8'), ('agent_id', 'u8'),
-                                        ('pnl', 'f8'), ('inventory', 'i8')])
-        }
+        result = _MOCK_RESULT
         
         dfs = create_dataframes(result)
         
@@ -269,6 +347,19 @@ class TestUtilities:
         assert len(dfs['trades']) == 1
         assert len(dfs['market_snapshots']) == 1
         assert len(dfs['agent_pnl']) == 1
+        
+        # Columns are views of the structured arrays, not copies
+        assert np.shares_memory(dfs['trades']['price'].to_numpy(), result['trades'])
+        assert dfs['agent_pnl']['pnl'].dtype == np.float64
+    
+    def test_results_cache_dataframes(self, sim_factory):
+        """Test that Results builds its DataFrames once."""
+        result = sim_factory(42).run(100)
+        
+        assert isinstance(result, Results)
+        assert isinstance(result, dict)
+        assert result.dfs is result.dfs
+        assert len(result.dfs['market_snapshots']) == len(result['market_snapshots'])
     
     def test_calculate_statistics(self):
         """Test statistics calculation."""
@@ -315,22 +406,63 @@ class TestUtilities:
         assert stats['total_volume'] == 120  # 50 + 30 + 40
         assert stats['vwap'] == (10000*50 + 10001*30 + 10002*40) / 120
     
+    def test_calculate_statistics_from_arrays(self):
+        """Test statistics calculation directly on structured arrays."""
+        result = {
+            'trades': np.array([(1000, 1, 2, 10000, 50), (1001, 2, 1, 10002, 30)], dtype=TRADE_DTYPE),
+            'market_snapshots': np.array([(1000, 9999, 10001, 100, 50, 10000),
+                                          (1001, 10000, 10004, 80, 60, 10002)], dtype=SNAPSHOT_DTYPE),
+            'agent_pnl': np.array([(1000, 2, 5.0, 1), (1000, 1, 10.0, 5), (1001, 1, -2.0, 3)],
+                                  dtype=PNL_DTYPE)
+        }
+        
+        stats = calculate_statistics(result)
+        
+        assert stats['total_trades'] == 2
+        assert stats['total_volume'] == 80
+        assert stats['vwap'] == (10000*50 + 10002*30) / 80
+        assert stats['avg_spread'] == 3.0
+        assert stats['avg_mid_price'] == 10001.0
+        assert stats['agent_performance'][1]['final_pnl'] == -2.0
+        assert stats['agent_performance'][1]['final_inventory'] == 3
+        assert stats['agent_performance'][1]['max_pnl'] == 10.0
+        assert stats['agent_performance'][2]['min_pnl'] == 5.0
+    
+    def test_analyze_liquidity(self):
+        """Test liquidity metrics against pandas on the same snapshots."""
+        snapshots = np.array([(1000 + i, 10000, 10000 + s, 100 + i, 50, 10000)
+                              for i, s in enumerate([1, 3, 2, 8, 2, 5, 1])], dtype=SNAPSHOT_DTYPE)
+        metrics = analyze_liquidity({'market_snapshots': snapshots})
+        
+        spread = pd.Series(snapshots['best_ask'] - snapshots['best_bid'])
+        depth = pd.Series(snapshots['best_bid_qty'] + snapshots['best_ask_qty'])
+        assert metrics['avg_spread'] == pytest.approx(spread.mean())
+        assert metrics['spread_volatility'] == pytest.approx(spread.std())
+        assert metrics['depth_volatility'] == pytest.approx(depth.std())
+        assert metrics['min_spread'] == 1
+        assert metrics['max_spread'] == 8
+        for key, q in [('25th', 0.25), ('50th', 0.50), ('75th', 0.75), ('95th', 0.95)]:
+            assert metrics['spread_percentiles'][key] == pytest.approx(spread.quantile(q))
+        
+        # Empty books (0/0 relative spread) are skipped, as pandas' mean skips NaN
+        relative_spread = spread / ((snapshots['best_bid'] + snapshots['best_ask']) / 2)
+        with_empty_book = np.concatenate((snapshots, np.zeros(1, dtype=SNAPSHOT_DTYPE)))
+        avg_relative_spread = analyze_liquidity({'market_snapshots': with_empty_book})['avg_relative_spread']
+        assert np.isfinite(avg_relative_spread)
+        assert avg_relative_spread == pytest.approx(relative_spread.mean())
+        
+        # Sums of squares of large quantities would overflow int64
+        large_depth = snapshots.copy()
+        large_depth['best_bid_qty'] += 2**32
+        metrics = analyze_liquidity({'market_snapshots': large_depth})
+        assert metrics['depth_volatility'] == pytest.approx(depth.std())
+        
+        assert analyze_liquidity({'market_snapshots': snapshots[:0]}) == {}
+    
     def test_save_results(self):
         """Test saving results to CSV files."""
         with tempfile.TemporaryDirectory() as temp_dir:
-            # Create mock result data
-            result = {
-                'trades': np.array([(1000, 1, 2, 10000, 50)], 
-                                  dtype=[('timestamp', 'i8'), ('maker_id', 'u8'), 
-                                         ('taker_id', 'u8'), ('price', 'i8'), ('quantity', 'i8')]),
-                'market_snapshots': np.array([(1000, 9999, 10001, 100, 50, 10000)],
-                                           dtype=[('timestamp', 'i8'), ('best_bid', 'i8'),
-                                                  ('best_ask', 'i8'), ('best_bid_qty', 'i8'),
-                                                  ('best_ask_qty', 'i8'), ('last_trade_price', 'i8')]),
-                'agent_pnl': np.array([(1000, 1, 100.5, 50)],
-                                     dtype=[('timestamp', 'i8'), ('agent_id', 'u8'),
-                                            ('pnl', 'f8'), ('inventory', 'i8')])
-            }
+            result = _MOCK_RESULT
             
             file_paths = save_results(result, temp_dir)
             
@@ -348,18 +480,267 @@ class TestUtilities:
             # Check file contents
             trades_df = pd.read_csv(file_paths['trades'])
             assert len(trades_df) == 1
-            assert trades_df.iloc[0]['timestamp'] == 1000
-            assert trades_df.iloc[0]['price'] == 10000
+            assert _first(trades_df, 'timestamp') == 1000
+            assert _first(trades_df, 'price') == 10000
+            
+            # The binary copies load back memory-mapped with the exact dtypes
+            loaded = load_results(temp_dir)
+            assert isinstance(loaded['trades'], np.memmap)
+            np.testing.assert_array_equal(loaded['trades'], result['trades'])
+            assert loaded['agent_pnl'].dtype == result['agent_pnl'].dtype
+    
+    def test_plot_results_empty(self):
+        """Test that plot_results writes nothing for an empty result."""
+        empty = {name: _MOCK_RESULT[name][:0] for name in _MOCK_RESULT}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            plot_results(empty, temp_dir)
+            assert os.listdir(temp_dir) == []
+    
+    def test_load_results_without_trades(self):
+        """Test that a zero-trade result round-trips (save_results skips empty tables)."""
+        result = dict(_MOCK_RESULT, trades=_MOCK_RESULT['trades'][:0])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_paths = save_results(result, temp_dir)
+            assert 'trades' not in file_paths
+            
+            loaded = load_results(temp_dir)
+            assert len(loaded['trades']) == 0
+            assert loaded['trades'].dtype == TRADE_DTYPE
+            np.testing.assert_array_equal(loaded['market_snapshots'], result['market_snapshots'])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(FileNotFoundError):
+                load_results(temp_dir)
+    
+    def test_save_results_parquet(self):
+        """Test the Parquet round trip through save_results and load_results."""
+        pytest.importorskip("pyarrow")
+        result = {
+            'trades': np.array([(1000, 1, 2, 10000, 50), (2000, 2, 1, 10001, 25)], dtype=TRADE_DTYPE),
+            'market_snapshots': np.array([(1000, 9999, 10001, 100, 50, 10000)], dtype=SNAPSHOT_DTYPE),
+            'agent_pnl': np.array([(1000, 1, 100.5, 50)], dtype=PNL_DTYPE)
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_paths = save_results(result, temp_dir, format='parquet', binary=False)
+            assert file_paths['trades'].endswith('trades.parquet')
+            
+            loaded = load_results(temp_dir)
+            for name in ('trades', 'market_snapshots', 'agent_pnl'):
+                assert loaded[name].dtype.names == result[name].dtype.names
+                for field in result[name].dtype.names:
+                    np.testing.assert_array_equal(loaded[name][field], result[name][field])
+        
+        with pytest.raises(ValueError):
+            save_results(result, 'unused', format='json')
+
+
+class TestStrategies:
+    """Test strategy backtesting."""
+    
+    def test_vectorized_backtest(self):
+        """Test fills and requote dedup of the vectorized quoting backtest."""
+        # Locked book: both quotes are marketable and fill at the touch
+        bid = np.array([100, 100, 0, 101, 101])
+        ask = np.array([100, 100, 0, 101, 103])
+        strategy = SimpleStrategy(1, spread=0, quantity=10)
+        
+        results = vectorized_backtest(strategy, bid, ask)
+        
+        # Ticks 0 and 3 quote and fill both sides; tick 1 repeats the same
+        # prices, tick 2 has an empty book and tick 4 is not marketable
+        assert results['total_trades'] == 4
+        assert results['final_inventory'] == 0
+        assert results['pnl'] == 0.0
+        assert strategy.last_bid == 102
+        assert strategy.last_ask == 102
+        
+        with pytest.raises(TypeError):
+            vectorized_backtest(object(), bid, ask)
+    
+    def test_quotes_requote_on_half_tick_moves(self):
+        """Test that quotes requote when the mid moves half a tick, even if the rounded price does not."""
+        # Crossed, then locked: the mid goes 101.5 -> 101, both bids round to 101
+        bid = np.array([102, 101])
+        ask = np.array([101, 101])
+        snapshots = [MarketSnapshot(int(b), int(a), 10, 10, 0, t) for t, (b, a) in enumerate(zip(bid, ask))]
+        
+        for run in (lambda s: vectorized_backtest(s, bid, ask), lambda s: backtest_strategy(s, snapshots)):
+            strategy = SimpleStrategy(1, spread=0, quantity=10)
+            results = run(strategy)
+            # Both sides fill on both ticks, at the touch
+            assert results['total_trades'] == 4
+            assert results['pnl'] == (102 - 101) * 10
+            assert results['final_inventory'] == 0
+            assert strategy.last_bid == strategy.last_ask == 101
+    
+    def test_backtest_applies_fills_each_tick(self):
+        """Test that the generic backtest fills each tick's orders before the next update."""
+        class CappedBuyer(BaseStrategy):
+            """Buys at the ask until it holds 100."""
+            def update(self, timestamp, market_snapshot, batch):
+                if self.inventory < 100:
+                    batch.push(timestamp, Side.BUY, market_snapshot.best_ask, 50, timestamp)
+        
+        snapshots = [MarketSnapshot(100, 102, 10, 10, 0, t) for t in range(10)]
+        results = backtest_strategy(CappedBuyer(1, "CappedBuyer"), snapshots)
+        
+        assert results['total_trades'] == 2
+        assert results['final_inventory'] == 100
+        assert results['pnl'] == -2 * 102 * 50
+
+
+# (strategy class, constructor kwargs) covering each compiled kernel's branches
+_BACKTEST_CASES = [
+    (SimpleStrategy, dict(spread=0)),
+    (SimpleStrategy, dict(spread=2)),
+    (SimpleStrategy, dict(spread=1, requote_threshold=3)),
+    (ArbitrageStrategy, dict(min_spread=-2)),
+    (ArbitrageStrategy, dict(min_spread=-4, requote_threshold=2)),
+    (MeanReversionStrategy, dict(lookback_period=20, threshold=0.00002)),
+    (MeanReversionStrategy, dict(lookback_period=100, threshold=0.0002)),
+    (MomentumStrategy, dict(lookback_period=30, momentum_threshold=0.00001)),
+]
+
+
+class TestBacktestEquivalence:
+    """The compiled kernels and the vectorized path against the generic update() loop."""
+    
+    @staticmethod
+    def _run_halves(strategy, backtest, bid, ask):
+        """Backtest the two halves of a series in turn, so state carries over between runs."""
+        half = len(bid) // 2
+        return [backtest(strategy, bid[part], ask[part])
+                for part in (slice(None, half), slice(half, None))]
+    
+    @staticmethod
+    def _generic_strategy(cls, kwargs):
+        """A subclass is not dispatched to a kernel, so it runs the generic loop."""
+        return type(f"Generic{cls.__name__}", (cls,), {})(1, **kwargs)
+    
+    @staticmethod
+    def _generic(strategy, bid, ask):
+        snapshots = [MarketSnapshot(int(b), int(a), 0, 0, 0, t) for t, (b, a) in enumerate(zip(bid, ask))]
+        return backtest_strategy(strategy, snapshots)
+    
+    @pytest.mark.parametrize('path', ['kernel', 'vectorized'])
+    @pytest.mark.parametrize('data', ['simulated', 'random_walk'])
+    @pytest.mark.parametrize('cls,kwargs', _BACKTEST_CASES,
+                             ids=[f"{cls.__name__}-{i}" for i, (cls, _) in enumerate(_BACKTEST_CASES)])
+    def test_matches_generic(self, backtest_quotes, cls, kwargs, data, path):
+        """Test that a fast backtest path gives the generic loop's results and final state."""
+        if path == 'kernel' and not KERNELS_AVAILABLE:
+            pytest.skip("compiled kernels need Numba")
+        if path == 'vectorized' and cls not in (SimpleStrategy, ArbitrageStrategy):
+            pytest.skip("vectorized_backtest only supports quoting strategies")
+        bid, ask = backtest_quotes[data]
+        
+        reference = self._generic_strategy(cls, kwargs)
+        expected = self._run_halves(reference, self._generic, bid, ask)
+        
+        strategy = cls(1, **kwargs)
+        fast = self._generic if path == 'kernel' else vectorized_backtest
+        actual = self._run_halves(strategy, fast, bid, ask)
+        
+        for got, want in zip(actual, expected):
+            assert got.keys() == want.keys()
+            assert got['strategy_name'] == want['strategy_name']
+            for key in ('total_trades', 'final_inventory'):
+                assert got[key] == want[key], key
+            for key in ('pnl', 'max_drawdown', 'sharpe_ratio', 'win_rate'):
+                assert got[key] == pytest.approx(want[key], rel=1e-9, abs=1e-12), key
+        
+        assert strategy.inventory == reference.inventory
+        if isinstance(strategy, (SimpleStrategy, ArbitrageStrategy)):
+            assert (strategy.last_bid, strategy.last_ask) == (reference.last_bid, reference.last_ask)
+        else:
+            assert strategy.last_action == reference.last_action
+            np.testing.assert_array_equal(strategy.price_history, reference.price_history)
+            assert strategy._sum_recent == pytest.approx(reference._sum_recent)
+            assert strategy._sum_older == pytest.approx(reference._sum_older)
+    
+    def test_cases_trade(self, backtest_quotes):
+        """Guard the equivalence data: every case must actually fill on the random walk."""
+        bid, ask = backtest_quotes['random_walk']
+        for cls, kwargs in _BACKTEST_CASES:
+            reference = self._generic_strategy(cls, kwargs)
+            assert self._generic(reference, bid, ask)['total_trades'] > 0, (cls.__name__, kwargs)
+
+
+@pytest.fixture(scope="module")
+def dashboard_app():
+    """The dashboard module, loaded from its file (it is not an installed package)."""
+    for module in ("flask", "flask_caching", "orjson"):
+        pytest.importorskip(module)
+    import importlib.util
+    path = Path(__file__).parent.parent.parent / "dashboard" / "app.py"
+    spec = importlib.util.spec_from_file_location("dashboard_app", path)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+
+class TestDashboardParser:
+    """simple_sim output lines through SimulationRunner.parse_line."""
+    
+    SIMPLE_SIM_OUTPUT = (
+        "=== Simulation Results ===\n"
+        "Total Events Processed: 8205\n"
+        "Total Trades: 1,227\n"
+        "Simulation Duration: 100000000 ns\n"
+        "Execution Time: 6.141 ms\n"
+        "Events per Second: 1.3361e+06\n"
+        "\n"
+        "Agent Performance:\n"
+        "Agent 1: PnL=2.42838e+06, Inventory=-243\n"
+        "Agent 2: PnL=-1.5e-03, Inventory=17\n"
+        "Agent 3: PnL=-42, Inventory=+5\n"
+        "Agent 4: PnL=.5E+2, Inventory=0\n"
+    )
+    
+    @pytest.fixture(params=["re2", "re"])
+    def runner(self, request, dashboard_app, monkeypatch):
+        """A runner whose agent-line regex is compiled with the requested backend."""
+        backend = pytest.importorskip(request.param)
+        pattern = dashboard_app.AGENT_LINE_RE.pattern
+        monkeypatch.setattr(dashboard_app, "AGENT_LINE_RE", backend.compile(pattern))
+        return dashboard_app.SimulationRunner()
+    
+    def test_parse_simulation_output(self, runner):
+        results = runner.parse_simulation_output(self.SIMPLE_SIM_OUTPUT)
+        
+        assert results['events_processed'] == 8205
+        assert results['trades'] == 1227
+        assert results['execution_time_ms'] == pytest.approx(6.141)
+        assert results['events_per_second'] == pytest.approx(1.3361e6)
+        assert results['agent_performance'] == {
+            '1': {'pnl': 2.42838e6, 'inventory': -243},
+            '2': {'pnl': -1.5e-3, 'inventory': 17},
+            '3': {'pnl': -42.0, 'inventory': 5},
+            '4': {'pnl': 50.0, 'inventory': 0},
+        }
+    
+    def test_parse_line_reports_matches(self, runner):
+        results = runner.empty_results()
+        
+        assert runner.parse_line("Total Trades: 227\n", results)
+        assert runner.parse_line("Agent 7: PnL=-3.25e+04, Inventory=-12\n", results)
+        assert not runner.parse_line("Simulation Duration: 100000000 ns\n", results)
+        assert not runner.parse_line("Agent Performance:\n", results)
+        assert not runner.parse_line("Agent 8: PnL=nan, Inventory=1\n", results)
+        assert not runner.parse_line("\n", results)
+        
+        assert results['trades'] == 227
+        assert results['agent_performance'] == {'7': {'pnl': -3.25e4, 'inventory': -12}}
 
 
 class TestIntegration:
     """Integration tests."""
     
-    def test_full_simulation_workflow(self):
+    def test_full_simulation_workflow(self, sim_factory):
         """Test complete simulation workflow."""
         with tempfile.TemporaryDirectory() as temp_dir:
             # Configure simulation
-            sim = Simulator(SimulationConfig(seed=42, output_dir=temp_dir))
+            sim = sim_factory(42, output_dir=temp_dir)
             
             maker_config = MarketMakerConfig(spread=2, quantity=50)
             taker_config = TakerConfig(intensity=0.8, quantity_mean=40)
@@ -3,12 +3,11 @@
 Market Microstructure Simulator CLI
 
 Command-line interface for running market microstructure simulations
-and generating analysis plots and CSV outputs.
+and generating analysis plots and CSV or Parquet outputs.
 """
 
 import argparse
 import sys
-import os
 import time
 from pathlib import Path
 
@@ -16,9 +15,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "python"))
 
 import numpy as np
-import pandas as pd
 from mms import Simulator, SimulationConfig, MarketMakerConfig, TakerConfig, NoiseTraderConfig
-from mms.utils import plot_results, save_results, benchmark_simulation, analyze_liquidity
+from mms.utils import plot_results, save_results, load_results, benchmark_simulation, analyze_liquidity
 
 
 def parse_arguments():
@@ -86,7 +84,9 @@ Examples:
     parser.add_argument('--no-plots', action='store_true',
                        help='Skip generating plots')
     parser.add_argument('--no-csv', action='store_true',
-                       help='Skip saving CSV files')
+                       help='Skip saving result files')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                       help='Result file format (default: csv; parquet requires pyarrow)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose output')
     
@@ -96,18 +96,24 @@ Examples:
     parser.add_argument('--iterations', type=int, default=5,
                        help='Number of benchmark iterations (default: 5)')
     parser.add_argument('--plot-only', action='store_true',
-                       help='Generate plots from existing CSV files in output directory')
+                       help='Generate plots from existing result files in output directory')
     
     return parser.parse_args()
 
 
+def _emit(*lines):
+    """Write a block of output lines with a single write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 def run_simulation(args):
     """Run the market microstructure simulation."""
-    print("🚀 Starting Market Microstructure Simulation")
-    print("=" * 50)
+    _emit("🚀 Starting Market Microstructure Simulation", "=" * 50)
     
     # Create output directory
-    os.makedirs(args.output_dir, exist_ok=True)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     # Create simulation configuration
     sim_config = SimulationConfig(
@@ -147,16 +153,16 @@ def run_simulation(args):
     
     # Print configuration
     if args.verbose:
-        print(f"Simulation Steps: {args.steps:,}")
-        print(f"Random Seed: {args.seed}")
-        print(f"Output Directory: {args.output_dir}")
-        print(f"Market Maker Spread: {args.maker_spread}")
-        print(f"Taker Intensity: {args.taker_intensity}")
-        print(f"Noise Limit Intensity: {args.noise_limit_intensity}")
-        print()
+        _emit(f"Simulation Steps: {args.steps:,}",
+              f"Random Seed: {args.seed}",
+              f"Output Directory: {args.output_dir}",
+              f"Market Maker Spread: {args.maker_spread}",
+              f"Taker Intensity: {args.taker_intensity}",
+              f"Noise Limit Intensity: {args.noise_limit_intensity}",
+              "")
     
     # Run simulation
-    print("⏳ Running simulation...")
+    _emit("⏳ Running simulation...")
     start_time = time.time()
     
     sim = Simulator(sim_config)
@@ -165,46 +171,49 @@ def run_simulation(args):
     end_time = time.time()
     simulation_time = end_time - start_time
     
-    print(f"✅ Simulation completed in {simulation_time:.2f} seconds")
-    print(f"📊 Events per second: {result['total_events_processed'][0] / simulation_time:,.0f}")
+    _emit(f"✅ Simulation completed in {simulation_time:.2f} seconds",
+          f"📊 Events per second: {result['total_events_processed'][0] / simulation_time:,.0f}")
     
     # Save results
     if not args.no_csv:
-        print("💾 Saving results to CSV...")
-        file_paths = save_results(result, args.output_dir)
-        for data_type, file_path in file_paths.items():
-            print(f"   {data_type}: {file_path}")
+        _emit(f"💾 Saving results to {args.format.upper()}...")
+        file_paths = save_results(result, args.output_dir, format=args.format)
+        _emit(*(f"   {data_type}: {file_path}" for data_type, file_path in file_paths.items()))
     
     # Generate plots
     if not args.no_plots:
-        print("📈 Generating plots...")
+        _emit("📈 Generating plots...")
         plot_results(result, args.output_dir)
-        print(f"   Plots saved to: {args.output_dir}/plots/")
-    
-    # Print summary statistics
-    print("\n📋 Simulation Summary:")
-    print("-" * 30)
-    print(f"Total Events Processed: {result['total_events_processed'][0]:,}")
-    print(f"Total Trades: {result['total_trades'][0]:,}")
-    print(f"Simulation Duration: {result['simulation_duration'][0]:,} ns")
-    print(f"Execution Time: {simulation_time:.2f} seconds")
+        _emit(f"   Plots saved to: {args.output_dir}/plots/")
+    
+    # Summary statistics
+    lines = [
+        "\n📋 Simulation Summary:",
+        "-" * 30,
+        f"Total Events Processed: {result['total_events_processed'][0]:,}",
+        f"Total Trades: {result['total_trades'][0]:,}",
+        f"Simulation Duration: {result['simulation_duration'][0]:,} ns",
+        f"Execution Time: {simulation_time:.2f} seconds",
+    ]
     
     # Analyze liquidity
     liquidity_metrics = analyze_liquidity(result)
     if liquidity_metrics:
-        print(f"\n💧 Liquidity Metrics:")
-        print(f"Average Spread: {liquidity_metrics['avg_spread']:.2f}")
-        print(f"Average Depth: {liquidity_metrics['avg_depth']:.2f}")
-        print(f"Spread Volatility: {liquidity_metrics['spread_volatility']:.2f}")
-    
-    print(f"\n🎯 Results saved to: {args.output_dir}/")
+        lines += [
+            "\n💧 Liquidity Metrics:",
+            f"Average Spread: {liquidity_metrics['avg_spread']:.2f}",
+            f"Average Depth: {liquidity_metrics['avg_depth']:.2f}",
+            f"Spread Volatility: {liquidity_metrics['spread_volatility']:.2f}",
+        ]
+    
+    lines.append(f"\n🎯 Results saved to: {args.output_dir}/")
+    _emit(*lines)
     return result
 
 
 def run_benchmark(args):
     """Run performance benchmark."""
-    print("🏃 Running Performance Benchmark")
-    print("=" * 40)
+    _emit("🏃 Running Performance Benchmark", "=" * 40)
     
     benchmark_results = benchmark_simulation(
         n_steps=args.steps,
@@ -212,63 +221,48 @@ def run_benchmark(args):
         iterations=args.iterations
     )
     
-    print(f"Benchmark Results ({args.iterations} iterations):")
-    print(f"  Mean Time: {benchmark_results['mean_time']:.3f} seconds")
-    print(f"  Std Time: {benchmark_results['std_time']:.3f} seconds")
-    print(f"  Min Time: {benchmark_results['min_time']:.3f} seconds")
-    print(f"  Max Time: {benchmark_results['max_time']:.3f} seconds")
-    print(f"  Events/Second: {benchmark_results['events_per_second']:,.0f}")
+    _emit(f"Benchmark Results ({args.iterations} iterations):",
+          f"  Mean Time: {benchmark_results['mean_time']:.3f} seconds",
+          f"  Std Time: {benchmark_results['std_time']:.3f} seconds",
+          f"  Min Time: {benchmark_results['min_time']:.3f} seconds",
+          f"  Max Time: {benchmark_results['max_time']:.3f} seconds",
+          f"  Events/Second: {benchmark_results['events_per_second']:,.0f}")
     
     # Save benchmark results
-    benchmark_file = os.path.join(args.output_dir, 'benchmark_results.txt')
-    os.makedirs(args.output_dir, exist_ok=True)
-    
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    benchmark_file = output_dir / 'benchmark_results.txt'
+    
+    header = (
+        "Market Microstructure Simulator Benchmark Results\n"
+        + "=" * 50 + "\n\n"
+        f"Steps: {args.steps:,}\n"
+        f"Seed: {args.seed}\n"
+        f"Iterations: {args.iterations}\n\n"
+    )
+    body = "".join(f"{key}: {value}\n" for key, value in benchmark_results.items())
     with open(benchmark_file, 'w') as f:
-        f.write("Market Microstructure Simulator Benchmark Results\n")
-        f.write("=" * 50 + "\n\n")
-        f.write(f"Steps: {args.steps:,}\n")
-        f.write(f"Seed: {args.seed}\n")
-        f.write(f"Iterations: {args.iterations}\n\n")
-        for key, value in benchmark_results.items():
-            f.write(f"{key}: {value}\n")
+        f.write(header + body)
     
-    print(f"\nBenchmark results saved to: {benchmark_file}")
+    _emit(f"\nBenchmark results saved to: {benchmark_file}")
 
 
 def plot_existing_results(args):
-    """Generate plots from existing CSV files."""
+    """Generate plots from existing CSV or Parquet files."""
     print("📈 Generating plots from existing results...")
     
-    if not os.path.exists(args.output_dir):
+    if not Path(args.output_dir).is_dir():
         print(f"❌ Output directory {args.output_dir} does not exist!")
         return
     
-    # Check for required CSV files
-    required_files = ['trades.csv', 'market_snapshots.csv', 'agent_pnl.csv']
-    missing_files = []
-    
-    for file_name in required_files:
-        file_path = os.path.join(args.output_dir, file_name)
-        if not os.path.exists(file_path):
-            missing_files.append(file_name)
-    
-    if missing_files:
-        print(f"❌ Missing required files: {', '.join(missing_files)}")
+    # Load data as numpy arrays (memory-mapped .npy, else Parquet, else CSV)
+    try:
+        result = load_results(args.output_dir)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
         return
     
-    # Load data and convert to numpy arrays
     try:
-        trades_df = pd.read_csv(os.path.join(args.output_dir, 'trades.csv'))
-        snapshots_df = pd.read_csv(os.path.join(args.output_dir, 'market_snapshots.csv'))
-        pnl_df = pd.read_csv(os.path.join(args.output_dir, 'agent_pnl.csv'))
-        
-        # Convert to the expected format
-        result = {
-            'trades': trades_df.to_records(index=False),
-            'market_snapshots': snapshots_df.to_records(index=False),
-            'agent_pnl': pnl_df.to_records(index=False)
-        }
-        
         # Generate plots
         plot_results(result, args.output_dir)
         print(f"✅ Plots generated successfully in: {args.output_dir}/plots/")
@@ -5,23 +5,37 @@ Basic functionality test for Market Microstructure Simulator
 
 import sys
 import os
+import atexit
+import multiprocessing
+import io
+import re
 import subprocess
-import tempfile
-import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+# gtest summary lines ("[  PASSED  ] 61 tests.") and the benchmark's throughput
+_GTEST_SUMMARY = re.compile(r'^\[  (PASSED|FAILED)  \] (\d+) tests?', re.MULTILINE)
+_THROUGHPUT = re.compile(r'^Average throughput:(.*)$', re.MULTILINE)
+
+# Executables checked and run from the CMake build directory
+_BUILD_DIR = os.path.abspath("build")
+_EXES = {name: os.path.join(_BUILD_DIR, name) for name in ("simple_sim", "benchmark", "mms_tests")}
+
+# Worker pool for the C++ checks, shared by every main() call in a process
+_POOL = None
 
 def test_cpp_build():
     """Test that C++ components build successfully."""
     print("🔨 Testing C++ build...")
     
     # Check if build directory exists
-    if not os.path.exists("build"):
+    if not os.path.exists(_BUILD_DIR):
         print("❌ Build directory not found")
         return False
     
     # Check if executables exist
-    executables = ["simple_sim", "benchmark", "mms_tests"]
-    for exe in executables:
-        exe_path = os.path.join("build", exe)
+    for exe, exe_path in _EXES.items():
         if not os.path.exists(exe_path):
             print(f"❌ Executable {exe} not found")
             return False
@@ -35,8 +49,7 @@ def test_cpp_simulation():
     
     try:
         result = subprocess.run(
-            ["./simple_sim"], 
-            cwd="build",
+            [_EXES["simple_sim"]],
             capture_output=True, 
             text=True, 
             timeout=10
@@ -64,23 +77,18 @@ def test_cpp_tests():
     
     try:
         result = subprocess.run(
-            ["./mms_tests"], 
-            cwd="build",
+            [_EXES["mms_tests"]],
             capture_output=True, 
             text=True, 
             timeout=30
         )
         
-        # Parse test results
-        output_lines = result.stdout.split('\n')
-        passed_tests = 0
-        failed_tests = 0
-        
-        for line in output_lines:
-            if '[  PASSED  ]' in line:
-                passed_tests = int(line.split()[2])
-            elif '[  FAILED  ]' in line:
-                failed_tests = int(line.split()[2])
+        # Parse test results (one scan for both summary counts)
+        counts = {'PASSED': 0, 'FAILED': 0}
+        for status, count in _GTEST_SUMMARY.findall(result.stdout):
+            counts[status] = int(count)
+        passed_tests = counts['PASSED']
+        failed_tests = counts['FAILED']
         
         total_tests = passed_tests + failed_tests
         
@@ -104,8 +112,7 @@ def test_cpp_benchmark():
     
     try:
         result = subprocess.run(
-            ["./benchmark", "5000", "2", "42"], 
-            cwd="build",
+            [_EXES["benchmark"], "5000", "2", "42"],
             capture_output=True, 
             text=True, 
             timeout=10
@@ -115,12 +122,9 @@ def test_cpp_benchmark():
             print("✅ C++ benchmark ran successfully")
             
             # Extract performance metrics
-            output_lines = result.stdout.split('\n')
-            for line in output_lines:
-                if "Average throughput:" in line:
-                    throughput = line.split(":")[1].strip()
-                    print(f"📈 Performance: {throughput}")
-                    break
+            match = _THROUGHPUT.search(result.stdout)
+            if match:
+                print(f"📈 Performance: {match.group(1).strip()}")
             
             return True
         else:
@@ -209,6 +213,25 @@ def test_python_files():
     print("✅ Python files have valid syntax")
     return True
 
+def _run_captured(test_func):
+    """Run a test, returning (result, printed output, elapsed milliseconds)."""
+    output = io.StringIO()
+    start = time.monotonic_ns()
+    with redirect_stdout(output):
+        result = test_func()
+    return result, output.getvalue(), (time.monotonic_ns() - start) / 1e6
+
+def _get_pool():
+    """Create the worker pool on first use; later calls reuse it."""
+    global _POOL
+    if _POOL is None:
+        # Forked workers start from this process's already-imported modules
+        context = (multiprocessing.get_context("fork")
+                   if "fork" in multiprocessing.get_all_start_methods() else None)
+        _POOL = ProcessPoolExecutor(max_workers=min(3, os.cpu_count() or 1), mp_context=context)
+        atexit.register(_POOL.shutdown)
+    return _POOL
+
 def main():
     """Run all tests."""
     print("🧪 Market Microstructure Simulator - Basic Functionality Test")
@@ -226,13 +249,27 @@ def main():
     passed = 0
     total = len(tests)
     
+    # These mostly wait on their own executables in build/, so they run in
+    # parallel worker processes; their output is still printed in test order
+    concurrent = (test_cpp_simulation, test_cpp_tests, test_cpp_benchmark)
+    
+    executor = _get_pool()
+    futures = {test_func: executor.submit(_run_captured, test_func) for test_func in concurrent}
+    
     for test_name, test_func in tests:
-        print(f"\n--- {test_name} ---")
+        sys.stdout.write(f"\n--- {test_name} ---\n")
         try:
-            if test_func():
+            if test_func in futures:
+                result, output, elapsed_ms = futures[test_func].result()
+            else:
+                result, output, elapsed_ms = _run_captured(test_func)
+            
+            # Each test's output and timing go out in one write
+            if result:
                 passed += 1
             else:
-                print(f"❌ {test_name} failed")
+                output += f"❌ {test_name} failed\n"
+            sys.stdout.write(output + f"⏱️  {elapsed_ms:.1f} ms\n")
         except Exception as e:
             print(f"❌ {test_name} error: {e}")
     